@@ -9,9 +9,13 @@ from __future__ import annotations
 
 import argparse
 import os
-import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from payment_analysis.agents.uc_tools.sql_statements import split_sql_statements
+
+_DDL_WORKERS = 8
+
 
 def _sql_path() -> Path:
     return Path(__file__).resolve().parent / "uc_agent_tools.sql"
@@ -26,9 +30,7 @@ def run(catalog: str, schema: str) -> None:
     raw = sql_path.read_text()
     sql_text = raw.replace("__CATALOG__", catalog).replace("__SCHEMA__", schema)
 
-    # Split into statements: semicolon followed by newline or end
-    parts = re.split(r";\s*(?=\n|$)", sql_text)
-    statements = [s.strip() for s in parts if s.strip()]
+    statements = split_sql_statements(sql_text)
 
     try:
         _spark = spark  # noqa: F821  # injected in Databricks notebook
@@ -40,10 +42,10 @@ def run(catalog: str, schema: str) -> None:
         except Exception as e:
             raise RuntimeError("run_create_uc_agent_tools must run in a Databricks context (spark available)") from e
 
-    for stmt in statements:
-        if not stmt.strip():
-            continue
-        _spark.sql(stmt)
+    # Each statement is an independent CREATE OR REPLACE FUNCTION, so submit them concurrently
+    # to overlap the per-DDL catalog round-trips.
+    with ThreadPoolExecutor(max_workers=_DDL_WORKERS) as executor:
+        list(executor.map(_spark.sql, statements))
 
     print(f"Created {len(statements)} UC agent tool functions in {catalog}.{schema}")
 
@@ -0,0 +1,47 @@
+"""Split SQL scripts into statements for ``spark.sql``, which runs one statement per call.
+
+Plain module with no package imports: the workspace notebook ``transform/run_create_uc_agent_tools`` loads it
+from this directory by path.
+"""
+from __future__ import annotations
+
+
+def split_sql_statements(sql_text: str) -> list[str]:
+    """Split a SQL script into statements on top-level ``;`` in a single pass.
+
+    Semicolons inside quotes (``'``, ``"``, backticks), ``$$`` function bodies and ``--``/``/* */``
+    comments do not end a statement. Chunks holding only comments are dropped.
+    """
+    statements: list[str] = []
+    start = i = 0
+    n = len(sql_text)
+    has_code = False
+    while i < n:
+        ch = sql_text[i]
+        if ch in "'\"`":
+            i += 1
+            while i < n and sql_text[i] != ch:
+                i += 2 if sql_text[i] == "\\" and ch != "`" else 1
+            i += 1
+            has_code = True
+        elif sql_text.startswith("$$", i):
+            end = sql_text.find("$$", i + 2)
+            i = n if end < 0 else end + 2
+            has_code = True
+        elif sql_text.startswith("--", i):
+            end = sql_text.find("\n", i)
+            i = n if end < 0 else end + 1
+        elif sql_text.startswith("/*", i):
+            end = sql_text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+        elif ch == ";":
+            if has_code:
+                statements.append(sql_text[start:i].strip())
+            start = i = i + 1
+            has_code = False
+        else:
+            has_code = has_code or not ch.isspace()
+            i += 1
+    if has_code:
+        statements.append(sql_text[start:].strip())
+    return statements
@@ -20,7 +20,9 @@ from .config import AppConfig
 from .lakebase_config import load_app_config_and_settings
 from .logger import logger
 from .router import api
+from .routes.decision import start_decision_log_flusher, stop_decision_log_flusher
 from .routes.notifications import install_log_handler
+from .routes.rules import start_rule_sync_flusher, stop_rule_sync_flusher
 from .runtime import Runtime
 from .services.databricks_service import DatabricksConfig, DatabricksService
 from .utils import add_not_found_handler
@@ -192,8 +194,18 @@ async def lifespan(app: FastAPI):
     app.state.config = config
     app.state.runtime = runtime
 
+    # Decision audit rows are batched off the request path when Lakebase is available
+    log_flusher = start_decision_log_flusher(runtime) if runtime._db_configured() else None
+    # Rule writes land in Lakebase first; their Lakehouse mirror writes are batched in the background
+    rule_sync_flusher = start_rule_sync_flusher() if runtime._db_configured() else None
+
     yield
 
+    if rule_sync_flusher is not None:
+        await stop_rule_sync_flusher(rule_sync_flusher)
+    if log_flusher is not None:
+        await stop_decision_log_flusher(runtime, log_flusher)
+
 
 app = FastAPI(
     title=_app_name,
@@ -190,6 +190,18 @@ class DatabaseConfig(BaseSettings):
         description="Optional direct Postgres URL for Lakebase (e.g. postgresql://user@host/databricks_postgres?sslmode=require). When set, app uses this instead of project/branch/endpoint discovery. Set LAKEBASE_OAUTH_TOKEN in Environment as the password (never commit the token).",
         validation_alias="LAKEBASE_CONNECTION_STRING",
     )
+    pool_size: int = Field(
+        default=10,
+        ge=1,
+        description="Persistent Lakebase connections kept per app process. Set LAKEBASE_POOL_SIZE.",
+        validation_alias="LAKEBASE_POOL_SIZE",
+    )
+    max_overflow: int = Field(
+        default=20,
+        ge=0,
+        description="Extra Lakebase connections opened under burst load beyond pool_size. Set LAKEBASE_MAX_OVERFLOW.",
+        validation_alias="LAKEBASE_MAX_OVERFLOW",
+    )
 
 
 class AppConfig(BaseSettings):
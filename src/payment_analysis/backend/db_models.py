@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from enum import Enum
 from typing import Any
 from uuid import uuid4
 
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, Index, JSON, text
 from sqlmodel import Field, SQLModel
 
 
@@ -50,6 +51,16 @@ class DecisionLog(SQLModel, table=True):
     Audit log of decisioning (auth, retry, routing, decline remediation).
     """
 
+    # Experiment results filter and group by these; partial because most decisions are not in an experiment.
+    __table_args__ = (
+        Index(
+            "idx_decisionlog_experiment_variant",
+            "experiment_id",
+            "variant",
+            postgresql_where=text("experiment_id IS NOT NULL"),
+        ),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=utcnow, index=True)
 
@@ -63,6 +74,64 @@ class DecisionLog(SQLModel, table=True):
         default_factory=dict, sa_column=Column(JSON, nullable=False)
     )
 
+    # Denormalized from response so experiment queries use a plain B-tree instead of JSON extraction
+    experiment_id: str | None = None
+    variant: str | None = None
+
+
+# Idempotent upgrades for tables that create_all() will not alter; "{schema}" is the app's Postgres schema.
+SCHEMA_UPGRADES: list[str] = [
+    # DecisionLog.experiment_id / variant: add once, backfill from the JSON response, then retire the
+    # expression index that served the old JSON predicate.
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = '{schema}' AND table_name = 'decisionlog' AND column_name = 'experiment_id'
+        ) THEN
+            ALTER TABLE "{schema}".decisionlog
+                ADD COLUMN IF NOT EXISTS experiment_id VARCHAR,
+                ADD COLUMN IF NOT EXISTS variant VARCHAR;
+            UPDATE "{schema}".decisionlog
+                SET experiment_id = response ->> 'experiment_id', variant = response ->> 'variant'
+                WHERE response ->> 'experiment_id' IS NOT NULL;
+            DROP INDEX IF EXISTS "{schema}".idx_decisionlog_experiment_id;
+        END IF;
+    END
+    $$
+    """,
+    # ExperimentAssignment (experiment_id, subject_key) becomes unique: before its index is first created,
+    # keep only the earliest assignment of any subject that a past race enrolled twice.
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_indexes
+            WHERE schemaname = '{schema}' AND indexname = 'idx_experimentassignment_experiment_subject'
+        ) THEN
+            DELETE FROM "{schema}".experimentassignment a
+                USING "{schema}".experimentassignment b
+                WHERE a.experiment_id = b.experiment_id AND a.subject_key = b.subject_key AND a.id > b.id;
+        END IF;
+    END
+    $$
+    """,
+]
+
+
+class ExperimentStatus(str, Enum):
+    """Lifecycle of an A/B experiment; stored as its string value."""
+
+    DRAFT = "draft"
+    RUNNING = "running"
+    PAUSED = "paused"
+    STOPPED = "stopped"
+
+
+# Experiments that accept new subject assignments
+ASSIGNABLE_EXPERIMENT_STATUSES: frozenset[str] = frozenset({ExperimentStatus.DRAFT.value, ExperimentStatus.RUNNING.value})
+
 
 class Experiment(SQLModel, table=True):
     id: str = Field(default_factory=lambda: uuid4().hex, primary_key=True)
@@ -71,13 +140,18 @@ class Experiment(SQLModel, table=True):
     name: str = Field(index=True)
     description: str | None = None
 
-    # draft | running | paused | stopped
-    status: str = Field(default="draft", index=True)
+    # ExperimentStatus value: draft | running | paused | stopped
+    status: str = Field(default=ExperimentStatus.DRAFT.value, index=True)
     started_at: datetime | None = None
     ended_at: datetime | None = None
 
 
 class ExperimentAssignment(SQLModel, table=True):
+    # One variant per subject: the get-or-insert in routes/decision.py resolves concurrent first requests on it.
+    __table_args__ = (
+        Index("idx_experimentassignment_experiment_subject", "experiment_id", "subject_key", unique=True),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=utcnow, index=True)
 
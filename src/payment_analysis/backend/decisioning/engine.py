@@ -20,7 +20,7 @@ import logging
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, cast
 
 from .rule_engine import evaluate_condition
 from .schemas import (
@@ -181,6 +181,22 @@ def _route_scores_list(rows: list[dict[str, Any]]) -> list[RouteScore]:
     return result
 
 
+def _enriched_ctx_dict(
+    ctx: DecisionContext, enriched: DecisionContext, ctx_dict: dict[str, Any] | None
+) -> dict[str, Any]:
+    """Serialized ``enriched`` for rule evaluation, patched from the caller's dump of ``ctx`` when given.
+
+    Enrichment only ever replaces ``risk_score`` and ``metadata``, so those two keys are all that can differ.
+    """
+    if ctx_dict is None:
+        from .policies import serialize_context
+
+        return serialize_context(enriched)
+    if enriched is ctx:
+        return ctx_dict
+    return {**ctx_dict, "risk_score": enriched.risk_score, "metadata": enriched.metadata}
+
+
 # ---------------------------------------------------------------------------
 # DecisionEngine
 # ---------------------------------------------------------------------------
@@ -273,7 +289,7 @@ class DecisionEngine:
                         self._runtime, active_only=True, limit=200
                     )
                     if result is not None:
-                        all_rules = result
+                        all_rules = cast(list[dict[str, Any]], result)
                 except Exception as e:
                     logger.debug("Could not load approval rules from Lakebase: %s", e)
             _rules_cache.data = all_rules
@@ -540,14 +556,16 @@ class DecisionEngine:
         return matching
 
     # -- Decision methods (data-driven) --------------------------------------
+    # Loaders, readers and the online-features writer use blocking Lakebase sessions, so the async decide_*
+    # methods run them in worker threads to keep the event loop free.
 
     async def decide_authentication(
-        self, ctx: DecisionContext, variant: str | None = None
+        self, ctx: DecisionContext, variant: str | None = None, ctx_dict: dict[str, Any] | None = None
     ) -> AuthDecisionOut:
         """Data-driven authentication decision: VS + ML (parallel) → recommendations → rule evaluation → policy."""
-        from .policies import decide_authentication as _policy_auth, serialize_context
+        from .policies import decide_authentication as _policy_auth
 
-        params = self._load_config()
+        params = await asyncio.to_thread(self._load_config)
 
         # P2 #13: Run Vector Search and ML enrichment in parallel
         vs_task = self._lookup_similar_transactions(ctx, params)
@@ -559,7 +577,7 @@ class DecisionEngine:
             enriched.metadata = {**enriched.metadata, **{f"vs_{k}": v for k, v in vs_context.items()}}
 
         # Agent recommendation enrichment (closes the recommendation loop)
-        recs = self._load_recommendations("authentication")
+        recs = await asyncio.to_thread(self._load_recommendations, "authentication")
         if recs:
             top_rec = recs[0]
             enriched = enriched.model_copy()
@@ -571,7 +589,7 @@ class DecisionEngine:
             }
 
         # P1 #4: Enrich with streaming real-time features (approval_rate_5m, etc.)
-        streaming = self._read_streaming_features(enriched)
+        streaming = await asyncio.to_thread(self._read_streaming_features, enriched)
         if streaming:
             enriched = enriched.model_copy()
             enriched.metadata = {**enriched.metadata, **{f"stream_{k}": v for k, v in streaming.items()}}
@@ -582,15 +600,16 @@ class DecisionEngine:
         # Write ML features to online_features table (populates the previously empty table)
         ml_features = {k: v for k, v in enriched.metadata.items() if k.startswith("ml_")}
         if ml_features:
-            self._write_online_features(
+            await asyncio.to_thread(
+                self._write_online_features,
                 entity_id=f"auth_{decision.audit_id}",
                 features=ml_features,
             )
 
         # Rule evaluation: check if any active authentication rules override
         if params.rule_engine_enabled:
-            ctx_dict = serialize_context(enriched)
-            matching = self._evaluate_rules(ctx_dict, "authentication")
+            ctx_dict = _enriched_ctx_dict(ctx, enriched, ctx_dict)
+            matching = await asyncio.to_thread(self._evaluate_rules, ctx_dict, "authentication")
             if matching:
                 top_rule = matching[0]
                 decision.reason = f"[Rule: {top_rule['name']}] {top_rule['action_summary']}"
@@ -603,13 +622,13 @@ class DecisionEngine:
         return decision
 
     async def decide_retry(
-        self, ctx: DecisionContext, variant: str | None = None
+        self, ctx: DecisionContext, variant: str | None = None, ctx_dict: dict[str, Any] | None = None
     ) -> RetryDecisionOut:
         """Data-driven retry decision: VS + retry ML (parallel) → recommendations → Lakebase codes → policy."""
         from .policies import decide_retry as _policy_retry
 
-        params = self._load_config()
-        decline_codes = self._load_decline_codes()
+        params = await asyncio.to_thread(self._load_config)
+        decline_codes = await asyncio.to_thread(self._load_decline_codes)
 
         # P2 #13: Run VS and retry ML in parallel
         async def _retry_ml() -> dict | None:
@@ -632,7 +651,7 @@ class DecisionEngine:
             enriched.metadata = {**enriched.metadata, **{f"vs_{k}": v for k, v in vs_context.items()}}
 
         # Agent recommendation enrichment
-        recs = self._load_recommendations("retry")
+        recs = await asyncio.to_thread(self._load_recommendations, "retry")
         if recs:
             enriched = enriched.model_copy()
             enriched.metadata = {
@@ -662,16 +681,16 @@ class DecisionEngine:
         # Write ML features to online_features
         ml_features = {k: v for k, v in enriched.metadata.items() if k.startswith("ml_")}
         if ml_features:
-            self._write_online_features(
+            await asyncio.to_thread(
+                self._write_online_features,
                 entity_id=f"retry_{decision.audit_id}",
                 features=ml_features,
             )
 
         # Rule evaluation for retry rules
         if params.rule_engine_enabled:
-            from .policies import serialize_context
-            ctx_dict = serialize_context(enriched)
-            matching = self._evaluate_rules(ctx_dict, "retry")
+            ctx_dict = _enriched_ctx_dict(ctx, enriched, ctx_dict)
+            matching = await asyncio.to_thread(self._evaluate_rules, ctx_dict, "retry")
             if matching:
                 top_rule = matching[0]
                 decision.reason = f"[Rule: {top_rule['name']}] {top_rule['action_summary']}"
@@ -679,13 +698,13 @@ class DecisionEngine:
         return decision
 
     async def decide_routing(
-        self, ctx: DecisionContext, variant: str | None = None
+        self, ctx: DecisionContext, variant: str | None = None, ctx_dict: dict[str, Any] | None = None
     ) -> RoutingDecisionOut:
         """Data-driven routing decision: VS + routing ML (parallel) → recommendations → Lakebase routes → policy."""
         from .policies import decide_routing as _policy_routing
 
-        params = self._load_config()
-        route_scores = self._load_routes()
+        params = await asyncio.to_thread(self._load_config)
+        route_scores = await asyncio.to_thread(self._load_routes)
 
         # P2 #13: Run VS and routing ML in parallel
         async def _routing_ml() -> dict | None:
@@ -708,7 +727,7 @@ class DecisionEngine:
             enriched.metadata = {**enriched.metadata, **{f"vs_{k}": v for k, v in vs_context.items()}}
 
         # Agent recommendation enrichment
-        recs = self._load_recommendations("routing")
+        recs = await asyncio.to_thread(self._load_recommendations, "routing")
         if recs:
             enriched = enriched.model_copy()
             enriched.metadata = {
@@ -736,16 +755,16 @@ class DecisionEngine:
         # Write ML features to online_features
         ml_features = {k: v for k, v in enriched.metadata.items() if k.startswith("ml_")}
         if ml_features:
-            self._write_online_features(
+            await asyncio.to_thread(
+                self._write_online_features,
                 entity_id=f"routing_{decision.audit_id}",
                 features=ml_features,
             )
 
         # Rule evaluation for routing rules
         if params.rule_engine_enabled:
-            from .policies import serialize_context
-            ctx_dict = serialize_context(enriched)
-            matching = self._evaluate_rules(ctx_dict, "routing")
+            ctx_dict = _enriched_ctx_dict(ctx, enriched, ctx_dict)
+            matching = await asyncio.to_thread(self._evaluate_rules, ctx_dict, "routing")
             if matching:
                 top_rule = matching[0]
                 decision.reason = f"[Rule: {top_rule['name']}] {top_rule['action_summary']}"
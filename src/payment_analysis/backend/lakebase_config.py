@@ -3,192 +3,213 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Literal, TypedDict, TypeVar, cast
 
-from sqlalchemy import text
+from sqlalchemy import Connection, RowMapping, text
 
 from .logger import logger
 
 if TYPE_CHECKING:
     from .runtime import Runtime
 
+_T = TypeVar("_T")
 
-def _safe_schema_name(raw: str) -> str:
-    """Validate and return a safe schema name for SQL interpolation."""
-    name = (raw or "payment_analysis").strip() or "payment_analysis"
-    if not name.replace("_", "").isalnum():
-        raise ValueError(f"Invalid schema name: {name!r} — only alphanumeric and underscore allowed")
-    return name
+# Rows per executemany batch for upserts; keeps each batch well under Postgres' bind-parameter limit.
+_UPSERT_PAGE_SIZE = 1000
 
+# online_features is polled by the dashboard; a short TTL absorbs repeated reads of the same page.
+_ONLINE_FEATURES_TTL_SECONDS = 5.0
+_online_features_cache: dict[tuple[str | None, int], tuple[float, list[dict[str, Any]]]] = {}
+_online_features_lock = threading.Lock()
 
-def load_app_config_and_settings(runtime: Runtime) -> tuple[tuple[str, str] | None, dict[str, str]]:
+
+def _requires_db(default: Any) -> Callable[[Callable[..., _T]], Callable[..., _T]]:
+    """Return ``default`` when Lakebase is not configured; otherwise call the helper with the validated ``_schema``.
+
+    Reads ``runtime.db_ctx`` (resolved once per process) instead of re-checking config on every call.
+    """
+
+    def deco(fn: Callable[..., _T]) -> Callable[..., _T]:
+        @wraps(fn)
+        def wrap(runtime: Runtime, *args: Any, **kwargs: Any) -> _T:
+            ctx = runtime.db_ctx
+            if not ctx.configured:
+                return default
+            return fn(runtime, *args, _schema=ctx.schema, **kwargs)
+
+        return wrap
+
+    return deco
+
+
+class ApprovalRuleRow(TypedDict):
+    """Shape of an ``approval_rules`` row; psycopg already returns these native types."""
+
+    id: str
+    name: str
+    rule_type: str
+    condition_expression: str | None
+    action_summary: str
+    priority: int
+    is_active: bool
+    created_at: datetime | None
+    updated_at: datetime | None
+
+
+def _approval_rule_from_row(r: RowMapping) -> ApprovalRuleRow:
+    """Build an approval rule dict from a mapped ``approval_rules`` row; only null/empty values are normalized."""
+    row = cast(ApprovalRuleRow, dict(r))
+    row["condition_expression"] = row["condition_expression"] or None
+    if row["priority"] is None:
+        row["priority"] = 100
+    if row["is_active"] is None:
+        row["is_active"] = True
+    return row
+
+
+@_requires_db((None, {}))
+def load_app_config_and_settings(runtime: Runtime, *, _schema: str) -> tuple[tuple[str, str] | None, dict[str, str]]:
     """
     Read app_config (catalog, schema) and app_settings (key-value) from Lakebase.
     Returns ((catalog, schema) or None, settings_dict). Use at startup before any Lakehouse calls.
     """
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured():
-        return (None, {})
-
     uc_config: tuple[str, str] | None = None
     settings: dict[str, str] = {}
 
     try:
         with runtime.get_session() as session:
             # Quoted identifier for PostgreSQL schema
-            q = text(f'SELECT catalog, schema FROM "{schema_name}".app_config LIMIT 1')
-            result = session.execute(q)
-            row = result.fetchone()
+            q = text(f'SELECT catalog, schema FROM "{_schema}".app_config LIMIT 1')
+            row = session.execute(q).mappings().first()
             if row:
-                c, s = str(row[0] or "").strip(), str(row[1] or "").strip()
+                c, s = str(row["catalog"] or "").strip(), str(row["schema"] or "").strip()
                 if c and s:
                     uc_config = (c, s)
 
-            q2 = text(f'SELECT key, value FROM "{schema_name}".app_settings')
-            result2 = session.execute(q2)
-            for r in result2.fetchall():
-                if r and len(r) >= 2:
-                    settings[str(r[0])] = str(r[1] or "")
+            q2 = text(f'SELECT key, value FROM "{_schema}".app_settings')
+            for r in session.execute(q2).mappings():
+                settings[str(r["key"])] = str(r["value"] or "")
     except Exception as e:
         logger.warning("Could not read app_config/app_settings from Lakebase: %s", e)
 
     return (uc_config, settings)
 
 
+def _upsert_app_settings(conn: Connection, rows: list[dict[str, str]], *, schema: str) -> None:
+    """Upsert ``{"key", "value"}`` rows into app_settings, one executemany per page of ``_UPSERT_PAGE_SIZE``."""
+    q = text(
+        f"""
+        INSERT INTO "{schema}".app_settings (key, value)
+        VALUES (:key, :value)
+        ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = current_timestamp
+        """
+    )
+    it = iter(rows)
+    while page := list(islice(it, _UPSERT_PAGE_SIZE)):
+        conn.execute(q, page)
+
+
 def write_app_settings_keys(runtime: Runtime, settings: dict[str, str]) -> bool:
-    """Write key-value pairs to Lakebase app_settings (e.g. control panel flags). Returns True on success."""
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured() or not settings:
+    """Write key-value pairs to Lakebase app_settings (e.g. control panel flags). Returns True on success.
+
+    Without Lakebase there is nothing to persist, so any non-empty ``settings`` counts as success.
+    """
+    ctx = runtime.db_ctx
+    if not ctx.configured or not settings:
         return bool(settings)
+    rows = [{"key": k, "value": v} for k, v in settings.items() if k and isinstance(v, str)]
     try:
-        with runtime.get_session() as session:
-            for key, val in settings.items():
-                if not key or not isinstance(val, str):
-                    continue
-                q = text(
-                    f"""
-                    INSERT INTO "{schema_name}".app_settings (key, value)
-                    VALUES (:key, :value)
-                    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = current_timestamp
-                    """
-                )
-                session.execute(q, {"key": key, "value": val})
-            session.commit()
+        with runtime.engine.begin() as conn:
+            _upsert_app_settings(conn, rows, schema=ctx.schema)
         return True
     except Exception as e:
         logger.warning("Could not write app_settings keys to Lakebase: %s", e)
         return False
 
 
-def write_app_config(runtime: Runtime, catalog: str, schema: str) -> bool:
+@_requires_db(False)
+def write_app_config(runtime: Runtime, catalog: str, schema: str, *, _schema: str) -> bool:
     """Write catalog and schema to Lakebase app_config and app_settings. Call after user saves config."""
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured():
-        return False
     try:
-        with runtime.get_session() as session:
+        with runtime.engine.begin() as conn:
             q = text(
                 f"""
-                INSERT INTO "{schema_name}".app_config (id, catalog, schema)
+                INSERT INTO "{_schema}".app_config (id, catalog, schema)
                 VALUES (1, :catalog, :schema)
                 ON CONFLICT (id) DO UPDATE SET catalog = EXCLUDED.catalog, schema = EXCLUDED.schema, updated_at = current_timestamp
                 """
             )
-            session.execute(q, {"catalog": catalog, "schema": schema})
-            for key, val in [("catalog", catalog), ("schema", schema)]:
-                q2 = text(
-                    f"""
-                    INSERT INTO "{schema_name}".app_settings (key, value)
-                    VALUES (:key, :value)
-                    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = current_timestamp
-                    """
-                )
-                session.execute(q2, {"key": key, "value": val})
-            session.commit()
+            conn.execute(q, {"catalog": catalog, "schema": schema})
+            _upsert_app_settings(
+                conn,
+                [{"key": "catalog", "value": catalog}, {"key": "schema", "value": schema}],
+                schema=_schema,
+            )
         return True
     except Exception as e:
         logger.warning("Could not write app_config to Lakebase: %s", e)
         return False
 
 
+@_requires_db(None)
 def get_approval_rules_from_lakebase(
     runtime: Runtime,
     *,
-    rule_type: str | None = None,
+    rule_types: list[str] | None = None,
     active_only: bool = False,
     limit: int = 200,
-) -> list[dict[str, Any]] | None:
-    """Read approval_rules from Lakebase. Returns list of dicts, or None on error/unconfigured (caller should fall back to Lakehouse)."""
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured():
-        return None
+    _schema: str,
+) -> list[ApprovalRuleRow] | None:
+    """Read approval_rules from Lakebase. Returns list of dicts, or None on error/unconfigured (caller should fall back to Lakehouse).
+
+    Filters are bound parameters of one fixed statement (empty ``rule_types`` means all types), so every
+    combination reuses the same cached/prepared query.
+    """
     limit = max(1, min(limit, 500))
     try:
         with runtime.get_session() as session:
-            where = "WHERE is_active = true" if active_only else ""
-            if rule_type:
-                where += f" AND rule_type = :rule_type" if where else "WHERE rule_type = :rule_type"
             q = text(
                 f"""
                 SELECT id, name, rule_type, condition_expression, action_summary, priority, is_active, created_at, updated_at
-                FROM "{schema_name}".approval_rules
-                {where}
+                FROM "{_schema}".approval_rules
+                WHERE (CAST(:active_only AS boolean) IS FALSE OR is_active = true)
+                  AND (CARDINALITY(CAST(:rule_types AS text[])) = 0 OR rule_type = ANY(CAST(:rule_types AS text[])))
                 ORDER BY priority ASC, updated_at DESC
                 LIMIT :limit
                 """
             )
-            params: dict[str, Any] = {"limit": limit}
-            if rule_type:
-                params["rule_type"] = rule_type
-            result = session.execute(q, params)
-            rows = result.fetchall()
-            return [
-                {
-                    "id": str(r[0]),
-                    "name": str(r[1]),
-                    "rule_type": str(r[2]),
-                    "condition_expression": str(r[3]) if r[3] else None,
-                    "action_summary": str(r[4]),
-                    "priority": int(r[5]) if r[5] is not None else 100,
-                    "is_active": bool(r[6]) if r[6] is not None else True,
-                    "created_at": r[7],
-                    "updated_at": r[8],
-                }
-                for r in rows
-            ]
+            params: dict[str, Any] = {"active_only": active_only, "rule_types": list(rule_types or []), "limit": limit}
+            return [_approval_rule_from_row(r) for r in session.execute(q, params).mappings()]
     except Exception as e:
         logger.debug("Could not read approval_rules from Lakebase: %s", e)
         return None
 
 
-def get_countries_from_lakebase(runtime: Runtime, *, limit: int = 200) -> list[dict[str, Any]] | None:
+@_requires_db(None)
+def get_countries_from_lakebase(runtime: Runtime, *, limit: int = 200, _schema: str) -> list[dict[str, Any]] | None:
     """Read countries/entities from Lakebase for the UI filter dropdown. Returns list of {code, name} or None on error/unconfigured."""
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured():
-        return None
     limit = max(1, min(limit, 500))
     try:
         with runtime.get_session() as session:
             q = text(
                 f"""
                 SELECT code, name
-                FROM "{schema_name}".countries
+                FROM "{_schema}".countries
                 WHERE is_active = true
                 ORDER BY display_order ASC, name ASC
                 LIMIT :limit
                 """
             )
-            result = session.execute(q, {"limit": limit})
-            rows = result.fetchall()
+            rows = session.execute(q, {"limit": limit}).mappings().all()
             if not rows:
                 return None
             return [
-                {"code": str(r[0] or "").strip() or "", "name": str(r[1] or "").strip() or ""}
+                {"code": str(r["code"] or "").strip(), "name": str(r["name"] or "").strip()}
                 for r in rows
             ]
     except Exception as e:
@@ -196,42 +217,27 @@ def get_countries_from_lakebase(runtime: Runtime, *, limit: int = 200) -> list[d
         return None
 
 
-def get_approval_rule_by_id(runtime: Runtime, rule_id: str) -> dict[str, Any] | None:
+@_requires_db(None)
+def get_approval_rule_by_id(runtime: Runtime, rule_id: str, *, _schema: str) -> ApprovalRuleRow | None:
     """Return one approval rule from Lakebase by id, or None if not found / unconfigured."""
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured():
-        return None
     try:
         with runtime.get_session() as session:
             q = text(
                 f"""
                 SELECT id, name, rule_type, condition_expression, action_summary, priority, is_active, created_at, updated_at
-                FROM "{schema_name}".approval_rules
+                FROM "{_schema}".approval_rules
                 WHERE id = :rule_id
                 LIMIT 1
                 """
             )
-            result = session.execute(q, {"rule_id": rule_id})
-            r = result.fetchone()
-            if not r:
-                return None
-            return {
-                "id": str(r[0]),
-                "name": str(r[1]),
-                "rule_type": str(r[2]),
-                "condition_expression": str(r[3]) if r[3] else None,
-                "action_summary": str(r[4]),
-                "priority": int(r[5]) if r[5] is not None else 100,
-                "is_active": bool(r[6]) if r[6] is not None else True,
-                "created_at": r[7],
-                "updated_at": r[8],
-            }
+            r = session.execute(q, {"rule_id": rule_id}).mappings().first()
+            return _approval_rule_from_row(r) if r else None
     except Exception as e:
         logger.debug("Could not read approval_rule by id from Lakebase: %s", e)
         return None
 
 
+@_requires_db(None)
 def create_approval_rule_in_lakebase(
     runtime: Runtime,
     *,
@@ -242,22 +248,20 @@ def create_approval_rule_in_lakebase(
     condition_expression: str | None = None,
     priority: int = 100,
     is_active: bool = True,
-) -> bool:
-    """Insert one approval rule into Lakebase. Returns True on success."""
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured():
-        return False
+    _schema: str,
+) -> ApprovalRuleRow | None:
+    """Insert one approval rule into Lakebase. Returns the stored row (server timestamps included), or None on error."""
     try:
-        with runtime.get_session() as session:
+        with runtime.engine.begin() as conn:
             q = text(
                 f"""
-                INSERT INTO "{schema_name}".approval_rules
+                INSERT INTO "{_schema}".approval_rules
                 (id, name, rule_type, condition_expression, action_summary, priority, is_active)
                 VALUES (:id, :name, :rule_type, :condition_expression, :action_summary, :priority, :is_active)
+                RETURNING id, name, rule_type, condition_expression, action_summary, priority, is_active, created_at, updated_at
                 """
             )
-            session.execute(
+            row = conn.execute(
                 q,
                 {
                     "id": id,
@@ -268,14 +272,14 @@ def create_approval_rule_in_lakebase(
                     "priority": priority,
                     "is_active": is_active,
                 },
-            )
-            session.commit()
-        return True
+            ).mappings().one()
+        return _approval_rule_from_row(row)
     except Exception as e:
         logger.warning("Could not create approval_rule in Lakebase: %s", e)
-        return False
+        return None
 
 
+@_requires_db(None)
 def update_approval_rule_in_lakebase(
     runtime: Runtime,
     rule_id: str,
@@ -286,114 +290,110 @@ def update_approval_rule_in_lakebase(
     action_summary: str | None = None,
     priority: int | None = None,
     is_active: bool | None = None,
-) -> bool | None:
-    """Update one approval rule in Lakebase. Returns True if a row was updated, False if rule not found (0 rows), None on error."""
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured():
-        return None
+    _schema: str,
+) -> ApprovalRuleRow | Literal[False] | None:
+    """Update one approval rule in Lakebase. Returns the updated row, False if rule not found (0 rows), None on error.
+
+    ``None`` fields keep their current value (COALESCE), so the statement text is the same for every call.
+    """
     try:
-        with runtime.get_session() as session:
-            # Build SET clause from provided fields
-            updates: list[str] = ["updated_at = current_timestamp"]
-            params: dict[str, Any] = {"rule_id": rule_id}
-            if name is not None:
-                updates.append("name = :name")
-                params["name"] = name
-            if rule_type is not None:
-                updates.append("rule_type = :rule_type")
-                params["rule_type"] = rule_type
-            if condition_expression is not None:
-                updates.append("condition_expression = :condition_expression")
-                params["condition_expression"] = condition_expression
-            if action_summary is not None:
-                updates.append("action_summary = :action_summary")
-                params["action_summary"] = action_summary
-            if priority is not None:
-                updates.append("priority = :priority")
-                params["priority"] = priority
-            if is_active is not None:
-                updates.append("is_active = :is_active")
-                params["is_active"] = is_active
-            if len(updates) <= 1:
-                # Only updated_at; still run UPDATE to touch the row
-                pass
+        with runtime.engine.begin() as conn:
             q = text(
                 f"""
-                UPDATE "{schema_name}".approval_rules
-                SET {", ".join(updates)}
+                UPDATE "{_schema}".approval_rules
+                SET name = COALESCE(:name, name),
+                    rule_type = COALESCE(:rule_type, rule_type),
+                    condition_expression = COALESCE(:condition_expression, condition_expression),
+                    action_summary = COALESCE(:action_summary, action_summary),
+                    priority = COALESCE(:priority, priority),
+                    is_active = COALESCE(:is_active, is_active),
+                    updated_at = current_timestamp
                 WHERE id = :rule_id
+                RETURNING id, name, rule_type, condition_expression, action_summary, priority, is_active, created_at, updated_at
                 """
             )
-            result = session.execute(q, params)
-            session.commit()
-            return (getattr(result, "rowcount", 0) or 0) > 0
+            row = conn.execute(
+                q,
+                {
+                    "rule_id": rule_id,
+                    "name": name,
+                    "rule_type": rule_type,
+                    "condition_expression": condition_expression,
+                    "action_summary": action_summary,
+                    "priority": priority,
+                    "is_active": is_active,
+                },
+            ).mappings().first()
+            return _approval_rule_from_row(row) if row is not None else False
     except Exception as e:
         logger.warning("Could not update approval_rule in Lakebase: %s", e)
         return None
 
 
-def delete_approval_rule_in_lakebase(runtime: Runtime, rule_id: str) -> bool:
+@_requires_db(False)
+def delete_approval_rule_in_lakebase(runtime: Runtime, rule_id: str, *, _schema: str) -> bool:
     """Delete one approval rule from Lakebase. Returns True if the DELETE ran successfully (idempotent: 0 or 1 row), False on error."""
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured():
-        return False
     try:
-        with runtime.get_session() as session:
-            q = text(f'DELETE FROM "{schema_name}".approval_rules WHERE id = :rule_id')
-            session.execute(q, {"rule_id": rule_id})
-            session.commit()
+        with runtime.engine.begin() as conn:
+            q = text(f'DELETE FROM "{_schema}".approval_rules WHERE id = :rule_id')
+            conn.execute(q, {"rule_id": rule_id})
             return True
     except Exception as e:
         logger.warning("Could not delete approval_rule from Lakebase: %s", e)
         return False
 
 
+@_requires_db(None)
 def get_online_features_from_lakebase(
     runtime: Runtime,
     *,
     source: str | None = None,
     limit: int = 100,
+    _schema: str,
 ) -> list[dict[str, Any]] | None:
     """Read online_features from Lakebase (last 24h). Returns list of dicts, or None on error (caller should fall back to Lakehouse)."""
-    config = runtime.config
-    schema_name = _safe_schema_name(config.db.db_schema or "payment_analysis")
-    if not runtime._db_configured():
-        return None
     limit = max(1, min(limit, 500))
+    src = source.lower() if source and source.lower() in ("ml", "agent") else None
+    key = (src, limit)
+    with _online_features_lock:
+        hit = _online_features_cache.get(key)
+    if hit is not None and (time.monotonic() - hit[0]) <= _ONLINE_FEATURES_TTL_SECONDS:
+        return hit[1]
     try:
         with runtime.get_session() as session:
             where = "WHERE created_at >= current_timestamp - interval '24 hours'"
-            if source and source.lower() in ("ml", "agent"):
+            if src:
                 where += " AND source = :source"
             q = text(
                 f"""
                 SELECT id, source, feature_set, feature_name, feature_value, feature_value_str, entity_id, created_at
-                FROM "{schema_name}".online_features
+                FROM "{_schema}".online_features
                 {where}
                 ORDER BY created_at DESC
                 LIMIT :limit
                 """
             )
             params: dict[str, Any] = {"limit": limit}
-            if source and source.lower() in ("ml", "agent"):
-                params["source"] = source.lower()
-            result = session.execute(q, params)
-            rows = result.fetchall()
-            return [
+            if src:
+                params["source"] = src
+            # Large pages use a server-side cursor so rows are fetched in batches instead of all at once.
+            options = {"stream_results": True, "yield_per": 200} if limit > 200 else {}
+            rows = [
                 {
-                    "id": str(r[0]),
-                    "source": str(r[1]),
-                    "feature_set": str(r[2]) if r[2] else None,
-                    "feature_name": str(r[3]),
-                    "feature_value": float(r[4]) if r[4] is not None else None,
-                    "feature_value_str": str(r[5]) if r[5] else None,
-                    "entity_id": str(r[6]) if r[6] else None,
-                    "created_at": r[7],
+                    "id": str(r["id"]),
+                    "source": str(r["source"]),
+                    "feature_set": str(r["feature_set"]) if r["feature_set"] else None,
+                    "feature_name": str(r["feature_name"]),
+                    "feature_value": float(r["feature_value"]) if r["feature_value"] is not None else None,
+                    "feature_value_str": str(r["feature_value_str"]) if r["feature_value_str"] else None,
+                    "entity_id": str(r["entity_id"]) if r["entity_id"] else None,
+                    "created_at": r["created_at"],
                 }
-                for r in rows
+                for r in session.execute(q, params, execution_options=options).mappings()
             ]
     except Exception as e:
         logger.debug("Could not read online_features from Lakebase: %s", e)
         return None
+    with _online_features_lock:
+        _online_features_cache[key] = (time.monotonic(), rows)
+    return rows
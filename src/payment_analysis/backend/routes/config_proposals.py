@@ -8,11 +8,12 @@ This closes the loop: data → ML → agents → proposed config → operator ap
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional, cast
+from typing import Any, Callable, Optional, cast
 
-from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
-from sqlalchemy import desc
+from sqlalchemy import desc, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import select
 
 from ..db_models import ProposedConfigChange, DecisionConfig, RetryableDeclineCode, RoutePerformance, utcnow
@@ -41,14 +42,25 @@ class ReviewIn(BaseModel):
 @router.get("", response_model=list[ProposedConfigChange], operation_id="listConfigProposals")
 def list_proposals(
     session: SessionDep,
+    response: Response,
     limit: int = Query(100, ge=1, le=200),
     status: Optional[str] = Query(None, description="Filter by status: pending, approved, rejected, applied"),
 ) -> list[ProposedConfigChange]:
+    """List proposals, newest first. The unpaginated match count is returned in ``X-Total-Count``.
+
+    ``COUNT(*) OVER()`` is evaluated before ``LIMIT``, so rows and total come back in one round-trip.
+    """
     limit = max(1, min(limit, 200))
-    stmt = select(ProposedConfigChange).order_by(desc(cast(Any, ProposedConfigChange.created_at))).limit(limit)
+    stmt = (
+        select(ProposedConfigChange, func.count().over().label("total"))
+        .order_by(desc(cast(Any, ProposedConfigChange.created_at)))
+        .limit(limit)
+    )
     if status:
         stmt = stmt.where(ProposedConfigChange.status == status)
-    return list(session.exec(stmt).all())
+    rows = session.exec(stmt).all()
+    response.headers["X-Total-Count"] = str(rows[0][1] if rows else 0)
+    return [proposal for proposal, _ in rows]
 
 
 @router.post("", response_model=ProposedConfigChange, operation_id="createConfigProposal")
@@ -65,13 +77,17 @@ def create_proposal(payload: ProposalIn, session: SessionDep) -> ProposedConfigC
     )
     session.add(proposal)
     session.commit()
-    session.refresh(proposal)
     return proposal
 
 
 @router.post("/{proposal_id}/review", response_model=ProposedConfigChange, operation_id="reviewConfigProposal")
 def review_proposal(proposal_id: str, payload: ReviewIn, session: SessionDep) -> ProposedConfigChange:
-    proposal = session.get(ProposedConfigChange, proposal_id)
+    # Lock the proposal row for the whole review so concurrent reviewers cannot double-apply.
+    proposal = session.exec(
+        select(ProposedConfigChange)
+        .where(ProposedConfigChange.id == proposal_id)
+        .with_for_update()
+    ).first()
     if not proposal:
         raise HTTPException(status_code=404, detail="Proposal not found")
     if proposal.status != "pending":
@@ -87,48 +103,66 @@ def review_proposal(proposal_id: str, payload: ReviewIn, session: SessionDep) ->
 
     # Auto-apply approved changes to Lakebase config tables
     if proposal.status == "approved":
+        # Savepoint: a failed upsert rolls back only itself, so the review can still be committed as "approved".
         try:
-            _apply_config_change(session, proposal)
+            with session.begin_nested():
+                _apply_config_change(session, proposal)
             proposal.status = "applied"
             proposal.applied_at = utcnow()
         except Exception as e:
             logger.warning("Failed to apply config change %s: %s", proposal_id, e)
             # Keep as "approved" — can be retried
 
-    session.add(proposal)
+    # proposal is already attached to the session; a single commit flushes it with any applied config
     session.commit()
-    session.refresh(proposal)
     return proposal
 
 
+def _decision_config_row(p: ProposedConfigChange) -> dict[str, Any]:
+    return {
+        "key": p.target_key,
+        "value": p.proposed_value,
+        "description": f"Applied from agent proposal: {p.rationale[:200]}",
+        "updated_at": utcnow(),
+    }
+
+
+def _decline_code_row(p: ProposedConfigChange) -> dict[str, Any]:
+    return {
+        "code": p.target_key,
+        "label": f"Agent-proposed: {p.target_key}",
+        "category": "soft",
+        "default_backoff_seconds": int(p.proposed_value),
+        "max_attempts": 3,
+        "is_active": True,
+        "updated_at": utcnow(),
+    }
+
+
+def _route_performance_row(p: ProposedConfigChange) -> dict[str, Any]:
+    return {"route_name": p.target_key, "approval_rate_pct": float(p.proposed_value), "updated_at": utcnow()}
+
+
+# change_type -> (model, key column, row builder, columns overwritten on conflict, insert missing rows)
+_APPLIERS: dict[str, tuple[Any, str, Callable[[ProposedConfigChange], dict[str, Any]], tuple[str, ...], bool]] = {
+    "decision_config": (DecisionConfig, "key", _decision_config_row, ("value", "updated_at"), True),
+    "decline_code": (RetryableDeclineCode, "code", _decline_code_row, ("default_backoff_seconds", "updated_at"), True),
+    # Routes are only tuned, never created from a proposal.
+    "route_performance": (RoutePerformance, "route_name", _route_performance_row, ("approval_rate_pct", "updated_at"), False),
+}
+
+
 def _apply_config_change(session: SessionDep, proposal: ProposedConfigChange) -> None:
-    """Apply an approved config change to the appropriate Lakebase table."""
-    if proposal.change_type == "decision_config":
-        existing = session.get(DecisionConfig, proposal.target_key)
-        if existing:
-            existing.value = proposal.proposed_value
-            existing.updated_at = utcnow()
-        else:
-            session.add(DecisionConfig(
-                key=proposal.target_key,
-                value=proposal.proposed_value,
-                description=f"Applied from agent proposal: {proposal.rationale[:200]}",
-            ))
-    elif proposal.change_type == "decline_code":
-        existing = session.get(RetryableDeclineCode, proposal.target_key)
-        if existing:
-            existing.default_backoff_seconds = int(proposal.proposed_value)
-            existing.updated_at = utcnow()
-        else:
-            session.add(RetryableDeclineCode(
-                code=proposal.target_key,
-                label=f"Agent-proposed: {proposal.target_key}",
-                default_backoff_seconds=int(proposal.proposed_value),
-            ))
-    elif proposal.change_type == "route_performance":
-        existing = session.get(RoutePerformance, proposal.target_key)
-        if existing:
-            existing.approval_rate_pct = float(proposal.proposed_value)
-            existing.updated_at = utcnow()
-    else:
+    """Apply an approved config change to the appropriate Lakebase table in a single statement."""
+    applier = _APPLIERS.get(proposal.change_type)
+    if applier is None:
         logger.warning("Unknown change_type %s — skipping auto-apply", proposal.change_type)
+        return
+    model, key_col, build_row, update_cols, insert_missing = applier
+    row = build_row(proposal)
+    changes = {c: row[c] for c in update_cols}
+    if insert_missing:
+        stmt: Any = pg_insert(model).values(**row).on_conflict_do_update(index_elements=[key_col], set_=changes)
+    else:
+        stmt = update(model).where(getattr(model, key_col) == row[key_col]).values(**changes)
+    session.execute(stmt)
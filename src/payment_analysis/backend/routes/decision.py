@@ -7,17 +7,24 @@ Validate with GET /api/v1/health/databricks. See docs/TECHNICAL_SOLUTION.md §5
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
-from typing import Any
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, cast
 
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from sqlmodel import select
+from sqlalchemy import exists as sa_exists, literal, select as sa_select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select, text
 
 logger = logging.getLogger(__name__)
 
-from ..db_models import DecisionLog, Experiment, ExperimentAssignment
+from ..db_models import ASSIGNABLE_EXPERIMENT_STATUSES, DecisionLog, Experiment, ExperimentAssignment, utcnow
 from ..services.databricks_service import MockDataGenerator
 from ..decisioning.engine import DecisionEngine
 from ..decisioning.policies import (
@@ -33,44 +40,201 @@ from ..decisioning.schemas import (
     RoutingDecisionOut,
 )
 from ..dependencies import SessionDep, DatabricksServiceDep, RuntimeDep
+from ..runtime import Runtime
 from ..utils import is_mock_request as _is_mock_request
 
 router = APIRouter(tags=["decisioning"])
 
+# Hot-path caches for A/B assignment (sync and async handlers share them, so guard with a lock).
+# Assignments never change once written; experiment status changes rarely and is invalidated on start/stop.
+_EXPERIMENT_STATUS_TTL_SECONDS = 60
+_ASSIGNMENT_CACHE_MAX = 100_000
+_experiment_status_cache: dict[str, tuple[float, str | None]] = {}
+_assignment_cache: OrderedDict[tuple[str, str], str] = OrderedDict()
+_ab_cache_lock = threading.Lock()
+
+
+# DecisionLog rows are audit-only, so they are written off the request path: handlers enqueue them and a
+# background flusher started in the app lifespan bulk-inserts them every _LOG_FLUSH_INTERVAL_S.
+_LOG_FLUSH_INTERVAL_S = 0.25
+_LOG_BATCH_MAX = 500
+_LOG_QUEUE_MAX = 10_000
+_log_queue: asyncio.Queue[DecisionLog] | None = None
+
+
+def _write_decision_logs(runtime: Runtime, batch: list[DecisionLog]) -> None:
+    """Insert a batch of DecisionLog rows in one transaction (asynchronous commit; rows are audit-only)."""
+    try:
+        with runtime.get_session() as session:
+            if session.get_bind().dialect.name == "postgresql":
+                session.execute(text("SET LOCAL synchronous_commit = OFF"))
+            session.add_all(batch)
+            session.commit()
+    except Exception as e:
+        logger.warning("Failed to write %d decision log rows: %s", len(batch), e)
+
+
+def _drain_log_queue(queue: asyncio.Queue[DecisionLog]) -> list[DecisionLog]:
+    batch: list[DecisionLog] = []
+    while len(batch) < _LOG_BATCH_MAX:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return batch
+
+
+async def _flush_decision_logs(runtime: Runtime, queue: asyncio.Queue[DecisionLog]) -> None:
+    while True:
+        await asyncio.sleep(_LOG_FLUSH_INTERVAL_S)
+        while batch := _drain_log_queue(queue):
+            await asyncio.to_thread(_write_decision_logs, runtime, batch)
+
+
+def start_decision_log_flusher(runtime: Runtime) -> asyncio.Task[None]:
+    """Create the DecisionLog queue and start its background flusher (call from the app lifespan)."""
+    global _log_queue
+    _log_queue = asyncio.Queue(maxsize=_LOG_QUEUE_MAX)
+    return asyncio.create_task(_flush_decision_logs(runtime, _log_queue))
+
+
+async def stop_decision_log_flusher(runtime: Runtime, task: asyncio.Task[None]) -> None:
+    """Stop the flusher and write whatever is still queued."""
+    global _log_queue
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    queue, _log_queue = _log_queue, None
+    if queue is not None:
+        while batch := _drain_log_queue(queue):
+            _write_decision_logs(runtime, batch)
+
+
+def invalidate_experiment_cache(experiment_id: str, subject_key: str | None = None) -> None:
+    """Drop cached status for an experiment (and one subject's cached variant, when given)."""
+    with _ab_cache_lock:
+        _experiment_status_cache.pop(experiment_id, None)
+        if subject_key is not None:
+            _assignment_cache.pop((experiment_id, subject_key), None)
+
+
+def _cache_assignment(key: tuple[str, str], variant: str) -> None:
+    with _ab_cache_lock:
+        _assignment_cache[key] = variant
+        _assignment_cache.move_to_end(key)
+        if len(_assignment_cache) > _ASSIGNMENT_CACHE_MAX:
+            _assignment_cache.popitem(last=False)
+
+
+def _experiment_status(session: SessionDep, experiment_id: str) -> str | None:
+    """Experiment status (None if missing), cached for ``_EXPERIMENT_STATUS_TTL_SECONDS``."""
+    with _ab_cache_lock:
+        hit = _experiment_status_cache.get(experiment_id)
+    if hit is not None and (time.monotonic() - hit[0]) <= _EXPERIMENT_STATUS_TTL_SECONDS:
+        return hit[1]
+    exp = session.get(Experiment, experiment_id)
+    status = exp.status if exp else None
+    with _ab_cache_lock:
+        _experiment_status_cache[experiment_id] = (time.monotonic(), status)
+    return status
+
 
 def _get_or_assign_variant(
     session: SessionDep,
     experiment_id: str | None,
     subject_key: str,
 ) -> str | None:
-    """Resolve A/B variant for this subject. If no assignment exists and experiment is assignable, auto-enroll with 50/50 control/treatment (deterministic by subject_key). Returns None if no experiment or experiment not assignable."""
+    """Resolve A/B variant for this subject. If no assignment exists and experiment is assignable, auto-enroll with 50/50 control/treatment (deterministic by experiment_id + subject_key). Returns None if no experiment or experiment not assignable."""
     if not experiment_id or not subject_key:
         return None
-    stmt = select(ExperimentAssignment).where(
-        ExperimentAssignment.experiment_id == experiment_id,
-        ExperimentAssignment.subject_key == subject_key,
-    ).limit(1)
-    assignment = session.exec(stmt).first()
-    if assignment:
-        return assignment.variant
-    exp = session.get(Experiment, experiment_id)
-    if not exp or exp.status not in {"running", "draft"}:
-        return None
-    variant = "treatment" if (hashlib.sha256(subject_key.encode()).digest()[-1] % 2 == 1) else "control"
-    session.add(
-        ExperimentAssignment(
-            experiment_id=experiment_id,
-            subject_key=subject_key,
-            variant=variant,
+    key = (experiment_id, subject_key)
+    with _ab_cache_lock:
+        cached = _assignment_cache.get(key)
+    if cached is not None:
+        return cached
+    if _experiment_status(session, experiment_id) not in ASSIGNABLE_EXPERIMENT_STATUSES:
+        # Not assignable: only an existing assignment counts
+        stmt = select(ExperimentAssignment.variant).where(
+            ExperimentAssignment.experiment_id == experiment_id,
+            ExperimentAssignment.subject_key == subject_key,
+        ).limit(1)
+        existing_variant = session.exec(stmt).first()
+        if existing_variant is not None:
+            _cache_assignment(key, existing_variant)
+        return existing_variant
+    row = session.execute(
+        _get_or_insert_assignment(experiment_id, subject_key, variant=_hash_variant(experiment_id, subject_key))
+    ).first()
+    if row is None:
+        # Lost the insert race to a concurrent first request. ON CONFLICT DO NOTHING waited only for the winner's
+        # insert-and-commit (it commits before any engine work), so its row is visible to this new statement.
+        variant = session.exec(
+            select(ExperimentAssignment.variant).where(
+                ExperimentAssignment.experiment_id == experiment_id,
+                ExperimentAssignment.subject_key == subject_key,
+            )
+        ).one()
+        _cache_assignment(key, variant)
+        return variant
+    variant, inserted = row
+    if inserted:
+        # Commit before the engine's ML calls so the connection is not left idle in transaction, a concurrent
+        # first request is not held in ON CONFLICT, and only a durable assignment is ever cached.
+        _commit_audit_rows(session)
+    _cache_assignment(key, variant)
+    return variant
+
+
+@lru_cache(maxsize=256)
+def _variant_hasher(experiment_id: str) -> Any:
+    """Keyed blake2b state per experiment; copying it skips re-keying (a full compression) for every subject."""
+    return hashlib.blake2b(key=experiment_id.encode()[:64], digest_size=8)
+
+
+def _hash_variant(experiment_id: str, subject_key: str) -> str:
+    """Deterministic 50/50 bucket, keyed by experiment so a subject's bucket is independent across experiments."""
+    h = _variant_hasher(experiment_id).copy()
+    h.update(subject_key.encode())
+    return "treatment" if h.digest()[-1] & 1 else "control"
+
+
+def _get_or_insert_assignment(experiment_id: str, subject_key: str, *, variant: str) -> Any:
+    """One statement that returns ``(variant, inserted)``: the existing assignment, or a newly inserted one.
+
+    Replaces SELECT-then-INSERT on a cache miss. Two first requests for one subject can both miss ``existing``;
+    the unique (experiment_id, subject_key) index makes the loser's insert a no-op, and it then gets no row back.
+    """
+    ea = cast(Any, ExperimentAssignment).__table__
+    existing = (
+        sa_select(ea.c.variant)
+        .where(ea.c.experiment_id == experiment_id, ea.c.subject_key == subject_key)
+        .limit(1)
+        .cte("existing")
+    )
+    inserted = (
+        pg_insert(ea)
+        .from_select(
+            ["experiment_id", "subject_key", "variant", "created_at"],
+            sa_select(
+                literal(experiment_id), literal(subject_key), literal(variant), literal(utcnow())
+            ).where(~sa_exists(sa_select(existing.c.variant))),
         )
+        .on_conflict_do_nothing(index_elements=["experiment_id", "subject_key"])
+        .returning(ea.c.variant)
+        .cte("inserted")
     )
-    session.commit()
-    return variant
+    return sa_select(existing.c.variant, literal(False)).union_all(sa_select(inserted.c.variant, literal(True)))
 
 
 def _with_ab(decision: Any, experiment_id: str | None, variant: str | None) -> dict[str, Any]:
-    """Merge experiment_id and variant into decision response for logging and response."""
-    out = decision.model_dump()
+    """JSON-ready decision dict with experiment_id and variant merged in, for the DecisionLog row.
+
+    One ``mode="json"`` dump (None fields dropped to keep the row small); the HTTP response is serialized by
+    FastAPI from ``decision`` itself.
+    """
+    out = decision.model_dump(mode="json", exclude_none=True)
     if experiment_id is not None:
         out["experiment_id"] = experiment_id
     if variant is not None:
@@ -118,6 +282,27 @@ class RetryPredictionOut(BaseModel):
     model_version: str
 
 
+_MOCK_PREDICTORS: dict[str, tuple[Any, type[BaseModel]]] = {
+    "approval": (MockDataGenerator.approval_prediction, ApprovalPredictionOut),
+    "risk": (MockDataGenerator.risk_prediction, RiskPredictionOut),
+    "routing": (MockDataGenerator.routing_prediction, RoutingPredictionOut),
+    "retry": (MockDataGenerator.retry_prediction, RetryPredictionOut),
+}
+
+
+@lru_cache(maxsize=4096)
+def _cached_mock_prediction(kind: str, items: tuple[tuple[str, Any], ...]) -> Any:
+    """Mock predictions are pure functions of the inputs; memoize the built response model."""
+    generate, out_model = _MOCK_PREDICTORS[kind]
+    result = generate(dict(items))
+    return out_model(**{k: v for k, v in result.items() if k != "_source"})
+
+
+def _mock_prediction(kind: str, features: MLPredictionInput) -> Any:
+    # Field values straight from the model instance; no model_dump() on the cached path
+    return _cached_mock_prediction(kind, tuple(features.__dict__.items()))
+
+
 async def _engine_decide(
     decision_type: str,
     ctx: DecisionContext,
@@ -139,18 +324,22 @@ async def _engine_decide(
     When Lakebase is not configured (e.g. local dev), falls back to pure-policy heuristics.
     """
     subject_key = ctx.subject_key or ctx.merchant_id
-    variant = _get_or_assign_variant(session, ctx.experiment_id, subject_key)
+    # Session calls are blocking; run them in a worker thread so the event loop keeps serving other requests.
+    variant = await asyncio.to_thread(_get_or_assign_variant, session, ctx.experiment_id, subject_key)
     variant = variant if variant is not None else "control"
 
+    # Serialized once: reused by the engine's rule evaluation and stored on the DecisionLog row
+    ctx_dict = serialize_context(ctx)
+
     # Try data-driven engine (Lakebase + ML + rules)
     try:
         engine = DecisionEngine(session=session, service=service, runtime=runtime)
         if decision_type == "authentication":
-            decision = await engine.decide_authentication(ctx, variant=variant)
+            decision = await engine.decide_authentication(ctx, variant=variant, ctx_dict=ctx_dict)
         elif decision_type == "retry":
-            decision = await engine.decide_retry(ctx, variant=variant)
+            decision = await engine.decide_retry(ctx, variant=variant, ctx_dict=ctx_dict)
         elif decision_type == "routing":
-            decision = await engine.decide_routing(ctx, variant=variant)
+            decision = await engine.decide_routing(ctx, variant=variant, ctx_dict=ctx_dict)
         else:
             raise ValueError(f"Unknown decision type: {decision_type}")
     except Exception as exc:
@@ -164,18 +353,37 @@ async def _engine_decide(
             decision = decide_routing(ctx, variant=variant)
 
     response = _with_ab(decision, ctx.experiment_id, variant)
-    session.add(
-        DecisionLog(
-            audit_id=decision.audit_id,
-            decision_type=decision_type,
-            request=serialize_context(ctx),
-            response=response,
-        )
+    log: DecisionLog | None = DecisionLog(
+        audit_id=decision.audit_id,
+        decision_type=decision_type,
+        request=ctx_dict,
+        response=response,
+        experiment_id=ctx.experiment_id,
+        variant=variant,
     )
-    session.commit()
+    if _log_queue is not None:
+        try:
+            _log_queue.put_nowait(log)
+            log = None
+        except asyncio.QueueFull:
+            logger.debug("Decision log queue full; writing %s inline", decision.audit_id)
+    if log is not None:
+        session.add(log)
+    if session.new:
+        await asyncio.to_thread(_commit_audit_rows, session)
     return decision
 
 
+def _commit_audit_rows(session: SessionDep) -> None:
+    """Commit pending audit rows (a new ExperimentAssignment, or a DecisionLog written inline).
+
+    Losing the last few ms of these on a crash is acceptable, so don't make the request wait for the WAL flush.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        session.execute(text("SET LOCAL synchronous_commit = OFF"))
+    session.commit()
+
+
 @router.post(
     "/authentication", response_model=AuthDecisionOut, operation_id="decideAuthentication"
 )
@@ -230,7 +438,7 @@ class DecisionConfigOut(BaseModel):
     response_model=DecisionConfigOut,
     operation_id="getDecisionConfigThresholds",
 )
-async def get_decision_config(
+def get_decision_config(
     session: SessionDep,
     service: DatabricksServiceDep,
     runtime: RuntimeDep,
@@ -277,7 +485,7 @@ class DecisionOutcomeOut(BaseModel):
     response_model=DecisionOutcomeOut,
     operation_id="recordDecisionOutcome",
 )
-async def record_outcome(
+def record_outcome(
     body: DecisionOutcomeIn,
     session: SessionDep,
     service: DatabricksServiceDep,
@@ -322,8 +530,7 @@ async def predict_approval(
 ) -> ApprovalPredictionOut:
     """Get approval probability from ML model serving endpoint. Mock when toggle is on."""
     if _is_mock_request(request):
-        result = MockDataGenerator.approval_prediction(features.model_dump())
-        return ApprovalPredictionOut(**{k: v for k, v in result.items() if k != "_source"})
+        return _mock_prediction("approval", features)
     try:
         result = await service.call_approval_model(features.model_dump())
     except Exception as exc:
@@ -344,8 +551,7 @@ async def predict_risk(
 ) -> RiskPredictionOut:
     """Get risk score from ML model serving endpoint. Mock when toggle is on."""
     if _is_mock_request(request):
-        result = MockDataGenerator.risk_prediction(features.model_dump())
-        return RiskPredictionOut(**{k: v for k, v in result.items() if k != "_source"})
+        return _mock_prediction("risk", features)
     try:
         result = await service.call_risk_model(features.model_dump())
     except Exception as exc:
@@ -366,8 +572,7 @@ async def predict_routing(
 ) -> RoutingPredictionOut:
     """Get optimal routing recommendation from ML model. Mock when toggle is on."""
     if _is_mock_request(request):
-        result = MockDataGenerator.routing_prediction(features.model_dump())
-        return RoutingPredictionOut(**{k: v for k, v in result.items() if k != "_source"})
+        return _mock_prediction("routing", features)
     try:
         result = await service.call_routing_model(features.model_dump())
     except Exception as exc:
@@ -388,8 +593,7 @@ async def predict_retry(
 ) -> RetryPredictionOut:
     """Get retry success likelihood from smart retry model. Mock when toggle is on."""
     if _is_mock_request(request):
-        result = MockDataGenerator.retry_prediction(features.model_dump())
-        return RetryPredictionOut(**{k: v for k, v in result.items() if k != "_source"})
+        return _mock_prediction("retry", features)
     try:
         result = await service.call_retry_model(features.model_dump())
     except Exception as exc:
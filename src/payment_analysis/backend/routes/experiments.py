@@ -3,18 +3,40 @@
 from __future__ import annotations
 
 import math
+import threading
+import time
 from typing import Any, Optional, cast
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import desc, func
+from sqlalchemy import case, desc, func, select as sa_select
 from sqlmodel import select
 
-from ..db_models import DecisionLog, DecisionOutcome, Experiment, ExperimentAssignment, utcnow
+from ..db_models import (
+    ASSIGNABLE_EXPERIMENT_STATUSES,
+    DecisionLog,
+    DecisionOutcome,
+    Experiment,
+    ExperimentAssignment,
+    ExperimentStatus,
+    utcnow,
+)
 from ..dependencies import SessionDep
+from .decision import invalidate_experiment_cache
 
 router = APIRouter(tags=["experiments"])
 
+# Results re-aggregate the decision log; a minute of staleness is fine for this dashboard view.
+_RESULTS_TTL_SECONDS = 60
+_results_cache: dict[str, tuple[float, ExperimentResultsOut]] = {}
+_results_lock = threading.Lock()
+
+
+def _invalidate_experiment(experiment_id: str) -> None:
+    invalidate_experiment_cache(experiment_id)
+    with _results_lock:
+        _results_cache.pop(experiment_id, None)
+
 
 class ExperimentIn(BaseModel):
     name: str = Field(min_length=1)
@@ -31,7 +53,6 @@ def create_experiment(payload: ExperimentIn, session: SessionDep) -> Experiment:
     exp = Experiment(name=payload.name, description=payload.description)
     session.add(exp)
     session.commit()
-    session.refresh(exp)
     return exp
 
 
@@ -52,11 +73,10 @@ def start_experiment(experiment_id: str, session: SessionDep) -> Experiment:
     exp = session.get(Experiment, experiment_id)
     if not exp:
         raise HTTPException(status_code=404, detail="Experiment not found")
-    exp.status = "running"
+    exp.status = ExperimentStatus.RUNNING.value
     exp.started_at = exp.started_at or utcnow()
-    session.add(exp)
     session.commit()
-    session.refresh(exp)
+    _invalidate_experiment(experiment_id)
     return exp
 
 
@@ -65,11 +85,10 @@ def stop_experiment(experiment_id: str, session: SessionDep) -> Experiment:
     exp = session.get(Experiment, experiment_id)
     if not exp:
         raise HTTPException(status_code=404, detail="Experiment not found")
-    exp.status = "stopped"
+    exp.status = ExperimentStatus.STOPPED.value
     exp.ended_at = utcnow()
-    session.add(exp)
     session.commit()
-    session.refresh(exp)
+    _invalidate_experiment(experiment_id)
     return exp
 
 
@@ -82,7 +101,7 @@ def assign(experiment_id: str, payload: AssignIn, session: SessionDep) -> Experi
     exp = session.get(Experiment, experiment_id)
     if not exp:
         raise HTTPException(status_code=404, detail="Experiment not found")
-    if exp.status not in {"running", "draft"}:
+    if exp.status not in ASSIGNABLE_EXPERIMENT_STATUSES:
         raise HTTPException(status_code=400, detail="Experiment is not assignable")
 
     assignment = ExperimentAssignment(
@@ -92,7 +111,7 @@ def assign(experiment_id: str, payload: AssignIn, session: SessionDep) -> Experi
     )
     session.add(assignment)
     session.commit()
-    session.refresh(assignment)
+    invalidate_experiment_cache(experiment_id, payload.subject_key)
     return assignment
 
 
@@ -146,83 +165,73 @@ def get_experiment_results(experiment_id: str, session: SessionDep) -> Experimen
 
     Joins experiment assignments → decision logs → decision outcomes to compute
     per-variant approval rates and statistical significance via a two-proportion z-test.
+    Results are cached per experiment for ``_RESULTS_TTL_SECONDS``; start/stop invalidate them.
     """
+    with _results_lock:
+        hit = _results_cache.get(experiment_id)
+    if hit is not None and (time.monotonic() - hit[0]) <= _RESULTS_TTL_SECONDS:
+        return hit[1]
+    results = _compute_experiment_results(experiment_id, session)
+    with _results_lock:
+        _results_cache[experiment_id] = (time.monotonic(), results)
+    return results
+
+
+def _compute_experiment_results(experiment_id: str, session: SessionDep) -> ExperimentResultsOut:
     exp = session.get(Experiment, experiment_id)
     if not exp:
         raise HTTPException(status_code=404, detail="Experiment not found")
 
-    # Get assignments per variant
-    assignments = session.exec(
-        select(ExperimentAssignment)
-        .where(ExperimentAssignment.experiment_id == experiment_id)
-    ).all()
-
-    variant_subjects: dict[str, set[str]] = {"control": set(), "treatment": set()}
-    for a in assignments:
-        if a.variant in variant_subjects:
-            variant_subjects[a.variant].add(a.subject_key)
-
-    # Get decision logs for these subjects
-    all_subject_keys = variant_subjects["control"] | variant_subjects["treatment"]
-    if not all_subject_keys:
+    # Distinct subjects per variant, counted in SQL
+    subject_counts: dict[str, int] = {
+        variant: count
+        for variant, count in session.exec(
+            select(ExperimentAssignment.variant, func.count(func.distinct(ExperimentAssignment.subject_key)))
+            .where(ExperimentAssignment.experiment_id == experiment_id)
+            .where(cast(Any, ExperimentAssignment.variant).in_(("control", "treatment")))
+            .group_by(ExperimentAssignment.variant)
+        ).all()
+    }
+    if not subject_counts:
         return ExperimentResultsOut(
             experiment_id=experiment_id,
             experiment_name=exp.name,
             status=exp.status,
         )
 
-    # Query decision outcomes joined to logs
-    variant_stats: dict[str, dict[str, Any]] = {}
-    for variant_name, subjects in variant_subjects.items():
-        if not subjects:
-            continue
-        # Count outcomes by looking at decision logs with matching experiment_id
-        decisions = session.exec(
-            select(DecisionLog)
-            .where(cast(Any, DecisionLog.response)["experiment_id"].as_string() == experiment_id)
-            .where(cast(Any, DecisionLog.response)["variant"].as_string() == variant_name)
-        ).all()
+    # One LEFT JOIN of decision logs to outcomes, aggregated per variant in SQL
+    stmt = (
+        sa_select(
+            DecisionLog.variant,
+            func.count(func.distinct(DecisionLog.id)),
+            func.count(DecisionOutcome.id),
+            func.sum(case((DecisionOutcome.outcome == "approved", 1), else_=0)),
+            func.avg(func.nullif(DecisionOutcome.latency_ms, 0)),
+        )
+        .select_from(DecisionLog)
+        .outerjoin(DecisionOutcome, DecisionOutcome.audit_id == DecisionLog.audit_id)
+        .where(DecisionLog.experiment_id == experiment_id)
+        .group_by(DecisionLog.variant)
+    )
+    aggregates = {row[0]: row[1:] for row in session.execute(stmt).all()}
+
+    # Build response stats straight from the SQL aggregates; approved counts are kept for the z-test
+    stats: dict[str, VariantStats] = {}
+    approved_by_variant: dict[str, int] = {}
+    for variant_name, subjects in subject_counts.items():
+        decisions, total_outcomes, approved, avg_latency = aggregates.get(variant_name, (0, 0, 0, None))
+        approved_by_variant[variant_name] = int(approved or 0)
+        stats[variant_name] = VariantStats(
+            variant=variant_name,
+            subjects=subjects,
+            decisions=int(decisions),
+            outcomes=int(total_outcomes),
+            approval_rate=(approved_by_variant[variant_name] / total_outcomes) if total_outcomes > 0 else None,
+            avg_latency_ms=float(avg_latency) if avg_latency is not None else None,
+        )
 
-        outcomes = session.exec(
-            select(DecisionOutcome)
-            .where(DecisionOutcome.audit_id.in_([d.audit_id for d in decisions]))  # type: ignore[union-attr]
-        ).all() if decisions else []
-
-        approved = sum(1 for o in outcomes if o.outcome == "approved")
-        total_outcomes = len(outcomes)
-
-        variant_stats[variant_name] = {
-            "subjects": len(subjects),
-            "decisions": len(decisions),
-            "outcomes": total_outcomes,
-            "approved": approved,
-            "approval_rate": (approved / total_outcomes) if total_outcomes > 0 else None,
-            "avg_latency_ms": (
-                sum(o.latency_ms for o in outcomes if o.latency_ms) / len([o for o in outcomes if o.latency_ms])
-                if any(o.latency_ms for o in outcomes) else None
-            ),
-        }
-
-    control = variant_stats.get("control")
-    treatment = variant_stats.get("treatment")
-
-    control_out = VariantStats(
-        variant="control",
-        subjects=control["subjects"] if control else 0,
-        decisions=control["decisions"] if control else 0,
-        outcomes=control["outcomes"] if control else 0,
-        approval_rate=control["approval_rate"] if control else None,
-        avg_latency_ms=control["avg_latency_ms"] if control else None,
-    ) if control else None
-
-    treatment_out = VariantStats(
-        variant="treatment",
-        subjects=treatment["subjects"] if treatment else 0,
-        decisions=treatment["decisions"] if treatment else 0,
-        outcomes=treatment["outcomes"] if treatment else 0,
-        approval_rate=treatment["approval_rate"] if treatment else None,
-        avg_latency_ms=treatment["avg_latency_ms"] if treatment else None,
-    ) if treatment else None
+    control = stats.get("control")
+    treatment = stats.get("treatment")
 
     # Compute lift and p-value
     lift_pct: float | None = None
@@ -231,44 +240,44 @@ def get_experiment_results(experiment_id: str, session: SessionDep) -> Experimen
     recommendation = "Not enough data to recommend."
 
     if (control and treatment
-            and control["outcomes"] > 0 and treatment["outcomes"] > 0
-            and control["approval_rate"] is not None and treatment["approval_rate"] is not None):
+            and control.outcomes > 0 and treatment.outcomes > 0
+            and control.approval_rate is not None and treatment.approval_rate is not None):
 
-        c_rate = control["approval_rate"]
-        t_rate = treatment["approval_rate"]
-        c_n = control["outcomes"]
-        t_n = treatment["outcomes"]
+        c_rate = control.approval_rate
+        t_rate = treatment.approval_rate
+        c_n = control.outcomes
+        t_n = treatment.outcomes
 
         if c_rate > 0:
             lift_pct = ((t_rate - c_rate) / c_rate) * 100
 
         # Two-proportion z-test
-        pooled = (control["approved"] + treatment["approved"]) / (c_n + t_n)
+        pooled = (approved_by_variant["control"] + approved_by_variant["treatment"]) / (c_n + t_n)
         if pooled > 0 and pooled < 1:
             se = math.sqrt(pooled * (1 - pooled) * (1 / c_n + 1 / t_n))
             if se > 0:
                 z = (t_rate - c_rate) / se
-                # Approximate p-value using normal CDF
-                p_value = 2 * (1 - _normal_cdf(abs(z)))
+                p_value = _two_sided_p_value(z)
                 is_significant = p_value < 0.05
 
+        p_text = _format_p_value(p_value)
         if is_significant:
             if lift_pct is not None and lift_pct > 0:
-                recommendation = f"Treatment shows +{lift_pct:.1f}% lift (p={p_value:.4f}). Recommend graduating treatment to production."
+                recommendation = f"Treatment shows +{lift_pct:.1f}% lift (p={p_text}). Recommend graduating treatment to production."
             elif lift_pct is not None and lift_pct < 0:
-                recommendation = f"Treatment shows {lift_pct:.1f}% decline (p={p_value:.4f}). Recommend stopping experiment and keeping control."
+                recommendation = f"Treatment shows {lift_pct:.1f}% decline (p={p_text}). Recommend stopping experiment and keeping control."
             else:
-                recommendation = f"No meaningful difference (p={p_value:.4f}). Consider extending the experiment."
+                recommendation = f"No meaningful difference (p={p_text}). Consider extending the experiment."
         else:
             min_samples = max(100, c_n + t_n)
-            recommendation = f"Not yet significant (p={p_value:.4f if p_value else 'N/A'}). Need ~{min_samples * 2} total outcomes for reliable results."
+            recommendation = f"Not yet significant (p={p_text}). Need ~{min_samples * 2} total outcomes for reliable results."
 
     return ExperimentResultsOut(
         experiment_id=experiment_id,
         experiment_name=exp.name,
         status=exp.status,
-        control=control_out,
-        treatment=treatment_out,
+        control=control,
+        treatment=treatment,
         lift_pct=lift_pct,
         p_value=p_value,
         is_significant=is_significant,
@@ -276,7 +285,16 @@ def get_experiment_results(experiment_id: str, session: SessionDep) -> Experimen
     )
 
 
-def _normal_cdf(x: float) -> float:
-    """Approximate the standard normal CDF using the error function."""
-    return 0.5 * (1 + math.erf(x / math.sqrt(2)))
+_SQRT2 = math.sqrt(2)
+
+
+def _two_sided_p_value(z: float) -> float:
+    """Two-sided normal p-value, ``2 * (1 - Φ(|z|))``, computed as ``erfc(|z|/√2)`` to avoid cancellation."""
+    return math.erfc(abs(z) / _SQRT2)
+
+
+def _format_p_value(p: float | None) -> str:
+    if p is None:
+        return "N/A"
+    return f"{p:.4f}" if p >= 1e-4 else f"{p:.1e}"
 
@@ -189,7 +189,6 @@ def resolve_incident(
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     incident.status = "resolved"
-    session.add(incident)
     session.commit()
     session.refresh(incident)
     # Sync status update to Lakehouse mirror — inherit catalog/schema from app state
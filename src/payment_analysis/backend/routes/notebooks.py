@@ -14,7 +14,7 @@ import os
 from enum import Enum
 from typing import Any
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
 from ..config import (
@@ -83,6 +83,9 @@ class NotebookCategory(str, Enum):
 
 class NotebookInfo(BaseModel):
     """Notebook metadata model."""
+    # Registry entries are shared module-level instances served to every request; keep them immutable.
+    model_config = {"frozen": True}
+
     id: str = Field(..., description="Unique notebook identifier")
     name: str = Field(..., description="Notebook display name")
     description: str = Field(..., description="Notebook purpose and functionality")
@@ -195,6 +198,17 @@ NOTEBOOKS = [
     ),
 ]
 
+# NOTEBOOKS is static, so the lookup indexes and counts are built once at import.
+_NOTEBOOKS_BY_ID: dict[str, NotebookInfo] = {n.id: n for n in NOTEBOOKS}
+# The workspace host depends on the request, but the path part of each notebook URL does not.
+_NOTEBOOK_URL_SUFFIXES: dict[str, str] = {n.id: f"/workspace{n.workspace_path}" for n in NOTEBOOKS}
+_BY_CATEGORY: dict[NotebookCategory, list[NotebookInfo]] = {c: [] for c in NotebookCategory}
+for _notebook in NOTEBOOKS:
+    _BY_CATEGORY[_notebook.category].append(_notebook)
+del _notebook
+# Only categories that have notebooks are reported, matching the previous per-request count.
+_CATEGORY_COUNTS: dict[str, int] = {c.value: len(v) for c, v in _BY_CATEGORY.items() if v}
+
 
 # =============================================================================
 # Endpoints
@@ -213,32 +227,22 @@ async def list_notebooks(
     Returns:
         List of notebooks with metadata
     """
-    filtered = NOTEBOOKS
-    
-    if category:
-        filtered = [n for n in filtered if n.category == category]
-    
-    # Count by category
-    by_category = {}
-    for notebook in NOTEBOOKS:
-        cat = notebook.category.value
-        by_category[cat] = by_category.get(cat, 0) + 1
-    
-    return NotebookList(
+    filtered = _BY_CATEGORY[category] if category else NOTEBOOKS
+    # Everything here was validated at import, so skip re-validating the registry per request.
+    return NotebookList.model_construct(
         notebooks=filtered,
         total=len(filtered),
-        by_category=by_category,
+        by_category=_CATEGORY_COUNTS,
     )
 
 
 @router.get("/notebooks/{notebook_id}", response_model=NotebookInfo, operation_id="getNotebook")
 async def get_notebook(notebook_id: str) -> NotebookInfo:
     """Get details for a specific notebook."""
-    for notebook in NOTEBOOKS:
-        if notebook.id == notebook_id:
-            return notebook
-    
-    raise HTTPException(status_code=404, detail=f"Notebook '{notebook_id}' not found")
+    notebook = _NOTEBOOKS_BY_ID.get(notebook_id)
+    if notebook is None:
+        raise HTTPException(status_code=404, detail=f"Notebook '{notebook_id}' not found")
+    return notebook
 
 
 class NotebookUrlOut(BaseModel):
@@ -256,10 +260,12 @@ async def get_notebook_url(
     config: ConfigDep,
 ) -> NotebookUrlOut:
     """Return absolute Databricks workspace URL for the notebook (opens in workspace)."""
-    notebook = await get_notebook(notebook_id)
+    notebook = _NOTEBOOKS_BY_ID.get(notebook_id)
+    if notebook is None:
+        raise HTTPException(status_code=404, detail=f"Notebook '{notebook_id}' not found")
     base_url = _workspace_base_url_for_request(request, config)
     workspace_path = notebook.workspace_path
-    full_url = f"{base_url}/workspace{workspace_path}" if base_url else ""
+    full_url = f"{base_url}{_NOTEBOOK_URL_SUFFIXES[notebook_id]}" if base_url else ""
     return NotebookUrlOut(
         notebook_id=notebook_id,
         name=notebook.name,
@@ -325,15 +331,22 @@ class NotebookCategorySummaryOut(BaseModel):
     total_notebooks: int
 
 
-@router.get("/notebooks/categories/summary", response_model=NotebookCategorySummaryOut, operation_id="getNotebookCategorySummary")
-async def get_category_summary() -> NotebookCategorySummaryOut:
-    """Get summary of notebooks by category with descriptions."""
+def _build_category_summary() -> NotebookCategorySummaryOut:
     categories: dict[str, NotebookCategoryDetail] = {}
-    for category in NotebookCategory:
-        in_cat = [n for n in NOTEBOOKS if n.category == category]
+    for category, in_cat in _BY_CATEGORY.items():
         categories[category.value] = NotebookCategoryDetail(
             name=category.value.replace("_", " ").title(),
             count=len(in_cat),
             notebooks=[NotebookCategorySummaryItem(id=n.id, name=n.name, job_name=n.job_name) for n in in_cat],
         )
     return NotebookCategorySummaryOut(categories=categories, total_notebooks=len(NOTEBOOKS))
+
+
+# Derived only from the static registry, so the JSON body is serialized once and served as-is.
+_CATEGORY_SUMMARY_JSON = _build_category_summary().model_dump_json()
+
+
+@router.get("/notebooks/categories/summary", response_model=NotebookCategorySummaryOut, operation_id="getNotebookCategorySummary")
+async def get_category_summary() -> Response:
+    """Get summary of notebooks by category with descriptions."""
+    return Response(content=_CATEGORY_SUMMARY_JSON, media_type="application/json")
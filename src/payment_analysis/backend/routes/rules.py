@@ -7,21 +7,28 @@ so that agents (reading Lakehouse) and the UI (reading Lakebase) stay in sync.
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import itertools
 import logging
-from typing import Optional
+import threading
+import time
+from typing import Any, Mapping, Optional
 from uuid import uuid4
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, Response
+from pydantic import BaseModel, Field, TypeAdapter
 
-from ..dependencies import DatabricksServiceDep
+from ..dependencies import DatabricksServiceDep, RuntimeDep
 from ..lakebase_config import (
+    ApprovalRuleRow,
     create_approval_rule_in_lakebase,
     delete_approval_rule_in_lakebase,
-    get_approval_rule_by_id,
     get_approval_rules_from_lakebase,
     update_approval_rule_in_lakebase,
 )
+from ..runtime import Runtime
+from ..services.databricks_service import DatabricksService
 
 logger = logging.getLogger(__name__)
 router = APIRouter(tags=["rules"])
@@ -60,22 +67,50 @@ class ApprovalRuleUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
-def _rule_row_to_out(row: dict) -> ApprovalRuleOut:
-    return ApprovalRuleOut(
+def _rule_row_to_out(row: Mapping[str, Any]) -> ApprovalRuleOut:
+    """Build ApprovalRuleOut from a Lakehouse row; every field is coerced explicitly, so validation is skipped."""
+    condition_expression = row.get("condition_expression")
+    created_at = row.get("created_at")
+    updated_at = row.get("updated_at")
+    return ApprovalRuleOut.model_construct(
         id=str(row["id"]),
         name=str(row["name"]),
         rule_type=str(row["rule_type"]),
-        condition_expression=str(row["condition_expression"]) if row.get("condition_expression") else None,
+        condition_expression=str(condition_expression) if condition_expression else None,
         action_summary=str(row["action_summary"]),
         priority=int(row.get("priority", 100)),
         is_active=bool(row.get("is_active", True)),
-        created_at=str(row["created_at"]) if row.get("created_at") else None,
-        updated_at=str(row["updated_at"]) if row.get("updated_at") else None,
+        created_at=str(created_at) if created_at else None,
+        updated_at=str(updated_at) if updated_at else None,
     )
 
 
+def _rule_row_to_out_fast(row: ApprovalRuleRow) -> ApprovalRuleOut:
+    """Build ApprovalRuleOut from a typed Lakebase row without re-validation; only timestamps need formatting."""
+    created_at, updated_at = row["created_at"], row["updated_at"]
+    return ApprovalRuleOut.model_construct(
+        id=row["id"],
+        name=row["name"],
+        rule_type=row["rule_type"],
+        condition_expression=row["condition_expression"],
+        action_summary=row["action_summary"],
+        priority=row["priority"],
+        is_active=row["is_active"],
+        created_at=str(created_at) if created_at else None,
+        updated_at=str(updated_at) if updated_at else None,
+    )
+
+
+_RULE_SYNC_FIELDS = ("name", "rule_type", "action_summary", "condition_expression", "priority", "is_active")
+
+
+def _rule_sync_fields(row: ApprovalRuleRow) -> dict[str, Any]:
+    """Keyword arguments for the mirror-sync helpers, taken from a stored rule row."""
+    return {k: row[k] for k in _RULE_SYNC_FIELDS}
+
+
 def _rule_row_from_payload(rule_id: str, payload: ApprovalRuleIn) -> dict:
-    """Build a rule dict from create payload for response (Lakebase path)."""
+    """Build a rule dict from create payload for response (no read-back after insert)."""
     return {
         "id": rule_id,
         "name": payload.name,
@@ -89,19 +124,28 @@ def _rule_row_from_payload(rule_id: str, payload: ApprovalRuleIn) -> dict:
     }
 
 
-def _find_rule_by_id(rows: list[dict], rule_id: str) -> ApprovalRuleOut | None:
-    """Return ApprovalRuleOut for rule_id if found in rows, else None."""
-    for r in rows:
-        if str(r.get("id")) == rule_id:
-            return _rule_row_to_out(r)
-    return None
-
-
 # =============================================================================
 # Background sync helpers — keep Lakebase and Lakehouse in sync
 # =============================================================================
 
 
+_lakehouse_service: DatabricksService | None = None
+
+
+def _lakehouse_sync_service() -> DatabricksService:
+    """Environment-configured service shared by all Lakehouse syncs (client and warehouse id resolved once).
+
+    Only an available service is kept, so credentials or a warehouse that show up after the first sync are used.
+    """
+    global _lakehouse_service
+    svc = _lakehouse_service
+    if svc is None:
+        svc = DatabricksService.create()
+        if svc.is_available:
+            _lakehouse_service = svc
+    return svc
+
+
 async def _sync_rule_to_lakehouse(
     *,
     action: str,
@@ -120,9 +164,7 @@ async def _sync_rule_to_lakehouse(
     both stores in sync ensures they always see the latest rules.
     """
     try:
-        from ..services.databricks_service import DatabricksService
-
-        svc = DatabricksService.create()
+        svc = _lakehouse_sync_service()
         if not svc.is_available:
             logger.debug("Databricks unavailable — skipping Lakehouse sync for rule %s", rule_id)
             return
@@ -156,8 +198,99 @@ async def _sync_rule_to_lakehouse(
         logger.warning("Failed to sync rule %s (%s) to Lakehouse", rule_id, action, exc_info=True)
 
 
+# Lakehouse mirroring is batched off the request path: handlers enqueue (action, rule_id, fields) and a
+# background flusher started in the app lifespan writes consecutive creates/deletes as one statement.
+_SYNC_FLUSH_INTERVAL_S = 0.5
+_SYNC_BATCH_MAX = 25
+_SYNC_QUEUE_MAX = 5_000
+_lakehouse_sync_queue: asyncio.Queue[tuple[str, str, dict[str, Any]]] | None = None
+
+
+async def _schedule_lakehouse_sync(
+    background_tasks: BackgroundTasks, action: str, rule_id: str, **fields: Any
+) -> None:
+    """Queue a Lakehouse mirror write; falls back to a per-request background task when no flusher is running.
+
+    A full queue makes the request wait for space rather than sync out of band, so a rule's update or delete
+    can never be mirrored ahead of its still-queued create.
+    """
+    if _lakehouse_sync_queue is not None:
+        await _lakehouse_sync_queue.put((action, rule_id, fields))
+        return
+    background_tasks.add_task(_sync_rule_to_lakehouse, action=action, rule_id=rule_id, **fields)
+
+
+async def _apply_lakehouse_syncs(batch: list[tuple[str, str, dict[str, Any]]]) -> None:
+    svc = _lakehouse_sync_service()
+    if not svc.is_available:
+        logger.debug("Databricks unavailable — skipping Lakehouse sync for %d rules", len(batch))
+        return
+    # Only consecutive runs of one action are merged, so a create followed by a delete keeps its order.
+    for action, run in itertools.groupby(batch, key=lambda item: item[0]):
+        items = list(run)
+        if action in ("create", "delete") and len(items) > 1:
+            try:
+                if action == "create":
+                    await svc.create_approval_rules([{"id": rule_id, **fields} for _, rule_id, fields in items])
+                else:
+                    await svc.delete_approval_rules([rule_id for _, rule_id, _ in items])
+                logger.debug("Synced %d rules (%s) to Lakehouse", len(items), action)
+                continue
+            except Exception:
+                logger.warning(
+                    "Batched Lakehouse sync of %d rules (%s) failed; retrying one by one", len(items), action, exc_info=True
+                )
+        for _, rule_id, fields in items:
+            await _sync_rule_to_lakehouse(action=action, rule_id=rule_id, **fields)
+
+
+def _drain_sync_queue(queue: asyncio.Queue[tuple[str, str, dict[str, Any]]]) -> list[tuple[str, str, dict[str, Any]]]:
+    batch: list[tuple[str, str, dict[str, Any]]] = []
+    while len(batch) < _SYNC_BATCH_MAX:
+        try:
+            batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            break
+    return batch
+
+
+async def _flush_lakehouse_syncs(queue: asyncio.Queue[tuple[str, str, dict[str, Any]]]) -> None:
+    while True:
+        await asyncio.sleep(_SYNC_FLUSH_INTERVAL_S)
+        while batch := _drain_sync_queue(queue):
+            # The batch has already left the queue, so a shutdown cancel must not abandon it mid-write:
+            # finish it, then let the cancellation through.
+            apply = asyncio.ensure_future(_apply_lakehouse_syncs(batch))
+            try:
+                await asyncio.shield(apply)
+            except asyncio.CancelledError:
+                await apply
+                raise
+
+
+def start_rule_sync_flusher() -> asyncio.Task[None]:
+    """Create the Lakehouse rule-sync queue and start its background flusher (call from the app lifespan)."""
+    global _lakehouse_sync_queue
+    _lakehouse_sync_queue = asyncio.Queue(maxsize=_SYNC_QUEUE_MAX)
+    return asyncio.create_task(_flush_lakehouse_syncs(_lakehouse_sync_queue))
+
+
+async def stop_rule_sync_flusher(task: asyncio.Task[None]) -> None:
+    """Stop the flusher and mirror whatever is still queued."""
+    global _lakehouse_sync_queue
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    queue, _lakehouse_sync_queue = _lakehouse_sync_queue, None
+    if queue is not None:
+        while batch := _drain_sync_queue(queue):
+            await _apply_lakehouse_syncs(batch)
+
+
 def _sync_rule_to_lakebase(
-    request: Request,
+    runtime: Runtime,
     *,
     action: str,
     rule_id: str,
@@ -174,8 +307,7 @@ def _sync_rule_to_lakebase(
     picks up rules that were created via the Lakehouse path.
     """
     try:
-        runtime = getattr(request.app.state, "runtime", None)
-        if not runtime or not runtime._db_configured():
+        if not runtime.db_ctx.configured:
             return
 
         if action == "create":
@@ -208,109 +340,133 @@ def _sync_rule_to_lakebase(
         logger.warning("Failed to sync rule %s (%s) to Lakebase", rule_id, action, exc_info=True)
 
 
+# Rule lists are serialized straight to JSON bytes; response_model stays on the route for the OpenAPI schema only.
+_RULE_LIST_ADAPTER = TypeAdapter(list[ApprovalRuleOut])
+
+# Rules change rarely but ML/agents poll the list hard, so Lakebase list bodies are cached briefly per query.
+# Every write through this API clears the cache; the generation counter stops a read that raced a write
+# from storing a pre-write body.
+_RULE_LIST_TTL_SECONDS = 5.0
+_RULE_LIST_CACHE_MAX = 256
+_rule_list_cache: dict[tuple[str | None, bool, int], tuple[float, bytes, str]] = {}
+_rule_list_generation = 0
+_rule_list_lock = threading.Lock()
+
+
+def _invalidate_rule_lists() -> None:
+    global _rule_list_generation
+    with _rule_list_lock:
+        _rule_list_generation += 1
+        _rule_list_cache.clear()
+
+
+def _rule_list_etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (t.strip().removeprefix("W/") for t in header.split(","))
+
+
+def _rule_list_response(request: Request, body: bytes, etag: str | None = None) -> Response:
+    """Serve a rule list body with an ETag, or an empty 304 when the client already holds that body.
+
+    ``no-cache`` (not ``max-age``) makes browsers revalidate every time, so a rule written through
+    this API is visible on the next poll while unchanged lists still cost only a 304.
+    """
+    etag = etag or _rule_list_etag(body)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @router.get("", response_model=list[ApprovalRuleOut], operation_id="listApprovalRules")
 async def list_approval_rules(
     request: Request,
+    runtime: RuntimeDep,
     service: DatabricksServiceDep,
     rule_type: Optional[str] = Query(None, description="Filter by rule_type: authentication, retry, or routing"),
     active_only: bool = Query(False, description="Return only active rules"),
     limit: int = Query(200, ge=1, le=500, description="Max number of rules to return"),
-) -> list[ApprovalRuleOut]:
+) -> Response:
     """List approval rules from Lakebase (if available) or Lakehouse. ML and AI agents read these to accelerate approval rates."""
-    runtime = getattr(request.app.state, "runtime", None)
-    if runtime and runtime._db_configured():
-        rows = get_approval_rules_from_lakebase(runtime, rule_type=rule_type, active_only=active_only, limit=limit)
+    if runtime.db_ctx.configured:
+        key = (rule_type, active_only, limit)
+        with _rule_list_lock:
+            hit = _rule_list_cache.get(key)
+            generation = _rule_list_generation
+        if hit is not None and (time.monotonic() - hit[0]) <= _RULE_LIST_TTL_SECONDS:
+            return _rule_list_response(request, hit[1], hit[2])
+        rows = await asyncio.to_thread(
+            get_approval_rules_from_lakebase,
+            runtime,
+            rule_types=[rule_type] if rule_type else None,
+            active_only=active_only,
+            limit=limit,
+        )
         if rows is not None:
-            return [_rule_row_to_out(r) for r in rows]
+            body = _RULE_LIST_ADAPTER.dump_json([_rule_row_to_out_fast(r) for r in rows] if rows else [])
+            etag = _rule_list_etag(body)
+            with _rule_list_lock:
+                if generation == _rule_list_generation:
+                    if len(_rule_list_cache) >= _RULE_LIST_CACHE_MAX:
+                        _rule_list_cache.clear()
+                    _rule_list_cache[key] = (time.monotonic(), body, etag)
+            return _rule_list_response(request, body, etag)
     rows = await service.get_approval_rules(rule_type=rule_type, active_only=active_only, limit=limit)
-    return [_rule_row_to_out(r) for r in rows]
+    body = _RULE_LIST_ADAPTER.dump_json([_rule_row_to_out(r) for r in rows] if rows else [])
+    return _rule_list_response(request, body)
 
 
 @router.post("", response_model=ApprovalRuleOut, operation_id="createApprovalRule")
 async def create_approval_rule(
-    request: Request,
+    runtime: RuntimeDep,
     service: DatabricksServiceDep,
     payload: ApprovalRuleIn,
     background_tasks: BackgroundTasks,
 ) -> ApprovalRuleOut:
     """Create an approval rule in Lakebase (when configured) or Lakehouse. Used by decisioning and AI agents."""
     rule_id = uuid4().hex
-    runtime = getattr(request.app.state, "runtime", None)
-
-    if runtime and runtime._db_configured():
-        ok = create_approval_rule_in_lakebase(
-            runtime,
-            id=rule_id,
-            name=payload.name,
-            rule_type=payload.rule_type,
-            action_summary=payload.action_summary,
-            condition_expression=payload.condition_expression,
-            priority=payload.priority,
-            is_active=payload.is_active,
-        )
-        if ok:
+    # ApprovalRuleIn's fields are exactly the rule columns, so one dict feeds the write and its mirror sync.
+    fields = payload.model_dump()
+    if runtime.db_ctx.configured:
+        created = await asyncio.to_thread(create_approval_rule_in_lakebase, runtime, id=rule_id, **fields)
+        if created:
+            _invalidate_rule_lists()
             # Sync to Lakehouse so agents see the new rule via v_approval_rules_active
-            background_tasks.add_task(
-                _sync_rule_to_lakehouse,
-                action="create",
-                rule_id=rule_id,
-                name=payload.name,
-                rule_type=payload.rule_type,
-                action_summary=payload.action_summary,
-                condition_expression=payload.condition_expression,
-                priority=payload.priority,
-                is_active=payload.is_active,
-            )
-            return _rule_row_to_out(_rule_row_from_payload(rule_id, payload))
+            await _schedule_lakehouse_sync(background_tasks, "create", rule_id, **fields)
+            return _rule_row_to_out_fast(created)
         raise HTTPException(status_code=502, detail="Failed to write rule to Lakebase.")
 
     if not service.is_available:
         raise HTTPException(status_code=503, detail="Databricks Lakehouse unavailable; cannot write rules.")
     try:
-        ok = await service.create_approval_rule(
-            id=rule_id,
-            name=payload.name,
-            rule_type=payload.rule_type,
-            action_summary=payload.action_summary,
-            condition_expression=payload.condition_expression,
-            priority=payload.priority,
-            is_active=payload.is_active,
-        )
+        ok = await service.create_approval_rule(id=rule_id, **fields)
     except RuntimeError as e:
         raise HTTPException(status_code=502, detail=f"Failed to write rule to Lakehouse: {e}")
     if not ok:
         raise HTTPException(status_code=502, detail="Failed to write rule to Lakehouse.")
     # Sync to Lakebase so UI reads pick up the new rule
-    background_tasks.add_task(
-        _sync_rule_to_lakebase,
-        request,
-        action="create",
-        rule_id=rule_id,
-        name=payload.name,
-        rule_type=payload.rule_type,
-        action_summary=payload.action_summary,
-        condition_expression=payload.condition_expression,
-        priority=payload.priority,
-        is_active=payload.is_active,
-    )
-    rows = await service.get_approval_rules(limit=1)
-    out = _find_rule_by_id(rows, rule_id)
-    return out or _rule_row_to_out(_rule_row_from_payload(rule_id, payload))
+    background_tasks.add_task(_sync_rule_to_lakebase, runtime, action="create", rule_id=rule_id, **fields)
+    return _rule_row_to_out(_rule_row_from_payload(rule_id, payload))
 
 
 @router.patch("/{rule_id}", response_model=ApprovalRuleOut, operation_id="updateApprovalRule")
 async def update_approval_rule(
-    request: Request,
+    runtime: RuntimeDep,
     service: DatabricksServiceDep,
     rule_id: str,
     payload: ApprovalRuleUpdate,
     background_tasks: BackgroundTasks,
 ) -> ApprovalRuleOut:
     """Update an approval rule in Lakebase (when configured) or Lakehouse."""
-    runtime = getattr(request.app.state, "runtime", None)
-
-    if runtime and runtime._db_configured():
-        result = update_approval_rule_in_lakebase(
+    if runtime.db_ctx.configured:
+        result = await asyncio.to_thread(
+            update_approval_rule_in_lakebase,
             runtime,
             rule_id,
             name=payload.name,
@@ -320,26 +476,15 @@ async def update_approval_rule(
             priority=payload.priority,
             is_active=payload.is_active,
         )
+        if result:
+            _invalidate_rule_lists()
         if result is None:
             raise HTTPException(status_code=502, detail="Failed to update rule in Lakebase.")
         if result is False:
             raise HTTPException(status_code=404, detail="Rule not found.")
-        row = get_approval_rule_by_id(runtime, rule_id)
-        if row:
-            # Sync updated rule to Lakehouse so agents see changes
-            background_tasks.add_task(
-                _sync_rule_to_lakehouse,
-                action="update",
-                rule_id=rule_id,
-                name=row.get("name", ""),
-                rule_type=row.get("rule_type", ""),
-                action_summary=row.get("action_summary", ""),
-                condition_expression=row.get("condition_expression"),
-                priority=row.get("priority", 100),
-                is_active=row.get("is_active", True),
-            )
-            return _rule_row_to_out(row)
-        raise HTTPException(status_code=404, detail="Rule not found after update.")
+        # Sync updated rule to Lakehouse so agents see changes
+        await _schedule_lakehouse_sync(background_tasks, "update", rule_id, **_rule_sync_fields(result))
+        return _rule_row_to_out_fast(result)
 
     if not service.is_available:
         raise HTTPException(status_code=503, detail="Databricks Lakehouse unavailable; cannot update rules.")
@@ -357,13 +502,12 @@ async def update_approval_rule(
         raise HTTPException(status_code=502, detail=f"Failed to update rule in Lakehouse: {e}")
     if not ok:
         raise HTTPException(status_code=502, detail="Failed to update rule in Lakehouse.")
-    rows = await service.get_approval_rules(limit=500)
-    out = _find_rule_by_id(rows, rule_id)
-    if out:
+    row = await service.get_approval_rule_by_id(rule_id)
+    if row:
         # Sync to Lakebase
         background_tasks.add_task(
             _sync_rule_to_lakebase,
-            request,
+            runtime,
             action="update",
             rule_id=rule_id,
             name=payload.name or "",
@@ -373,28 +517,23 @@ async def update_approval_rule(
             priority=payload.priority if payload.priority is not None else 100,
             is_active=payload.is_active if payload.is_active is not None else True,
         )
-        return out
+        return _rule_row_to_out(row)
     raise HTTPException(status_code=404, detail="Rule not found after update.")
 
 
 @router.delete("/{rule_id}", status_code=204, operation_id="deleteApprovalRule")
 async def delete_approval_rule(
-    request: Request,
+    runtime: RuntimeDep,
     service: DatabricksServiceDep,
     rule_id: str,
     background_tasks: BackgroundTasks,
 ) -> None:
     """Delete an approval rule from Lakebase (when configured) or Lakehouse."""
-    runtime = getattr(request.app.state, "runtime", None)
-
-    if runtime and runtime._db_configured():
-        if delete_approval_rule_in_lakebase(runtime, rule_id):
+    if runtime.db_ctx.configured:
+        if await asyncio.to_thread(delete_approval_rule_in_lakebase, runtime, rule_id):
+            _invalidate_rule_lists()
             # Sync delete to Lakehouse so agents no longer see this rule
-            background_tasks.add_task(
-                _sync_rule_to_lakehouse,
-                action="delete",
-                rule_id=rule_id,
-            )
+            await _schedule_lakehouse_sync(background_tasks, "delete", rule_id)
             return
         raise HTTPException(status_code=502, detail="Failed to delete rule from Lakebase.")
 
@@ -409,7 +548,7 @@ async def delete_approval_rule(
     # Sync delete to Lakebase
     background_tasks.add_task(
         _sync_rule_to_lakebase,
-        request,
+        runtime,
         action="delete",
         rule_id=rule_id,
     )
@@ -38,6 +38,7 @@ class HealthDatabaseOut(BaseModel):
     connection_healthy: bool
     status: str
     lakebase_mode: str = Field("", description="'autoscaling' when Lakebase Autoscaling is configured, '' otherwise.")
+    pool_status: str = Field("", description="SQLAlchemy connection pool status (size, checked in/out, overflow) for capacity tuning.")
 
 
 @router.get("/healthcheck", response_model=HealthcheckOut, operation_id="healthcheck")
@@ -65,11 +66,13 @@ async def health_database(request: Request) -> HealthDatabaseOut:
         )
     instance_exists = rt._db_configured()
     connection_healthy = False
+    pool_status = ""
     if instance_exists:
         try:
             with rt.get_session() as session:
                 session.execute(text("SELECT 1"))
             connection_healthy = True
+            pool_status = rt.engine.pool.status()
         except Exception:
             pass
     lakebase_mode = ""
@@ -83,6 +86,7 @@ async def health_database(request: Request) -> HealthDatabaseOut:
         connection_healthy=connection_healthy,
         status="healthy" if (instance_exists and connection_healthy) else "unhealthy",
         lakebase_mode=lakebase_mode,
+        pool_status=pool_status,
     )
 
 
@@ -1,6 +1,8 @@
 import os
+import re
 import threading
 import time
+from dataclasses import dataclass
 from functools import cached_property
 from urllib.parse import urlparse, urlunparse
 
@@ -13,6 +15,9 @@ from .lakebase_helpers import discover_endpoint_name, resolve_endpoint_host, _ge
 from .logger import logger
 
 TOKEN_REFRESH_INTERVAL_S = 50 * 60
+# Lakebase OAuth tokens live ~1h; past this age a cached token is refreshed inline on connect.
+TOKEN_MAX_AGE_S = 55 * 60
+_SCHEMA_RE = re.compile(r"\A[A-Za-z0-9_]+\Z")
 
 
 def _normalize_lakebase_url(raw: str) -> str:
@@ -27,9 +32,23 @@ def _normalize_lakebase_url(raw: str) -> str:
     return urlunparse(parsed)
 
 
+@dataclass(frozen=True)
+class DbContext:
+    """Database facts resolved once per process and shared by the Lakebase helpers."""
+
+    configured: bool
+    schema: str
+
+
 class Runtime:
     def __init__(self, config: AppConfig) -> None:
         self.config = config
+        # One pooled engine per process; the lock stops concurrent first requests from each building one.
+        self._engine: Engine | None = None
+        self._engine_lock = threading.Lock()
+        # Serializes Lakebase credential RPCs between the refresh daemon and pool connects (re-entrant:
+        # the stale-token path refreshes while already holding it).
+        self._token_lock = threading.RLock()
 
     @cached_property
     def _dev_db_port(self) -> int | None:
@@ -79,6 +98,11 @@ class Runtime:
             return True
         return self._use_lakebase_autoscaling()
 
+    @cached_property
+    def db_ctx(self) -> DbContext:
+        """Whether Lakebase is configured and the validated schema name (config does not change at runtime)."""
+        return DbContext(configured=self._db_configured(), schema=self._db_schema_name)
+
     @cached_property
     def _endpoint_name(self) -> str:
         """Actual Lakebase endpoint resource name (auto-discovers if configured name doesn't match).
@@ -138,11 +162,24 @@ class Runtime:
 
     def _refresh_lakebase_token(self) -> str:
         """Generate a fresh Lakebase credential and cache it. Thread-safe."""
-        postgres_api = _get_postgres_api(self.ws)
-        cred = postgres_api.generate_database_credential(endpoint=self._endpoint_name)
-        self._cached_lakebase_token = cred.token
-        self._token_last_refresh = time.monotonic()
-        return cred.token
+        with self._token_lock:
+            postgres_api = _get_postgres_api(self.ws)
+            cred = postgres_api.generate_database_credential(endpoint=self._endpoint_name)
+            self._cached_lakebase_token = cred.token
+            self._token_last_refresh = time.monotonic()
+            return cred.token
+
+    def _lakebase_token(self) -> str:
+        """Cached Lakebase credential; only hits the credential API when the daemon has let it go stale."""
+        cached = getattr(self, "_cached_lakebase_token", None)
+        if cached and time.monotonic() - self._token_last_refresh < TOKEN_MAX_AGE_S:
+            return cached
+        with self._token_lock:
+            # Another connect may have refreshed while this one waited for the lock.
+            cached = getattr(self, "_cached_lakebase_token", None)
+            if cached and time.monotonic() - self._token_last_refresh < TOKEN_MAX_AGE_S:
+                return cached
+            return self._refresh_lakebase_token()
 
     def _start_token_refresh_daemon(self) -> None:
         """Start a background daemon thread that refreshes the Lakebase token every 50 min.
@@ -174,20 +211,26 @@ class Runtime:
             if token:
                 cparams["password"] = token
             return
-        cached = getattr(self, "_cached_lakebase_token", None)
-        if cached:
-            cparams["password"] = cached
-        else:
-            cparams["password"] = self._refresh_lakebase_token()
+        cparams["password"] = self._lakebase_token()
 
     @cached_property
     def _db_schema_name(self) -> str:
         """Validated Postgres schema name used for search_path and SQLModel."""
         raw = (self.config.db.db_schema or "payment_analysis").strip()
-        return raw if raw.replace("_", "").isalnum() else "payment_analysis"
+        return raw if _SCHEMA_RE.match(raw) else "payment_analysis"
 
-    @cached_property
+    @property
     def engine(self) -> Engine:
+        """Process-wide pooled engine, created on first use."""
+        engine = self._engine
+        if engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = self._create_engine()
+                engine = self._engine
+        return engine
+
+    def _create_engine(self) -> Engine:
         if not self._db_configured():
             raise ValueError(
                 "Database not configured. Set LAKEBASE_PROJECT_ID, LAKEBASE_BRANCH_ID, LAKEBASE_ENDPOINT_ID "
@@ -205,14 +248,17 @@ class Runtime:
         else:
             # Lakebase: token injected per connection (OAuth expires ~1h). pool_recycle < 1h.
             # See https://apps-cookbook.dev/docs/fastapi/getting_started/lakebase_connection
-            # Pool config aligned with Apps Cookbook: pool_size=5, max_overflow=10, pool_timeout=10.
+            # Sized so concurrent requests reuse warm connections instead of paying TCP+TLS+OAuth per call;
+            # pre-ping drops sockets that Lakebase closed (e.g. after scale-to-zero) before handing them out.
             engine = create_engine(
                 self.engine_url,
                 pool_recycle=45 * 60,
-                pool_pre_ping=False,
-                pool_size=5,
-                max_overflow=10,
+                pool_pre_ping=True,
+                pool_size=self.config.db.pool_size,
+                max_overflow=self.config.db.max_overflow,
                 pool_timeout=10,
+                # Page size for multi-row INSERT batching (executemany) on Core/ORM inserts.
+                insertmanyvalues_page_size=1000,
                 connect_args={
                     "sslmode": "require",
                     "options": f"-csearch_path={schema},public",
@@ -230,7 +276,9 @@ class Runtime:
             raise RuntimeError(
                 "Database not configured. Set LAKEBASE_PROJECT_ID, LAKEBASE_BRANCH_ID, LAKEBASE_ENDPOINT_ID in the app Environment."
             )
-        return Session(self.engine)
+        # Keep committed attributes loaded: every table uses Python-side defaults and the INSERT already
+        # RETURNs generated keys, so re-reading rows after commit (session.refresh) is a wasted round-trip.
+        return Session(self.engine, expire_on_commit=False)
 
     def validate_db(self) -> None:
         if not self._db_configured():
@@ -313,4 +361,15 @@ class Runtime:
                 conn.commit()
 
         SQLModel.metadata.create_all(self.engine)
+        # create_all skips tables that already exist: apply column upgrades, then create any explicitly
+        # declared (idx_*) indexes that were added to a model after its table was created.
+        from .db_models import SCHEMA_UPGRADES
+
+        with self.engine.begin() as conn:
+            for upgrade in SCHEMA_UPGRADES:
+                conn.execute(text(upgrade.replace("{schema}", schema_name)))
+            for table in SQLModel.metadata.tables.values():
+                for index in table.indexes:
+                    if index.name and str(index.name).startswith("idx_"):
+                        index.create(conn, checkfirst=True)
         logger.info("Database models initialized successfully")
@@ -16,9 +16,13 @@ Design Patterns:
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
@@ -52,9 +56,37 @@ class RiskTier(str, Enum):
         return cls.HIGH
 
 
+_SQL_IDENTIFIER_RE = re.compile(r"\A[A-Za-z0-9_]+\Z")
+
+# Model Serving responses keyed by (endpoint, engineered features). Inputs are low-cardinality, so repeated
+# predictions are common; floats are rounded to 2 decimals in the key only.
+_PREDICTION_CACHE_TTL_SECONDS = 300
+_PREDICTION_CACHE_MAX = 4096
+_prediction_cache: OrderedDict[tuple[Any, ...], tuple[float, dict[str, Any]]] = OrderedDict()
+_prediction_cache_lock = threading.Lock()
+
+
+# WorkspaceClients (and their pooled HTTP sessions) shared across per-request DatabricksService instances,
+# keyed by a digest of the credentials, so Model Serving and warehouse calls reuse warm keep-alive connections.
+# Entries expire with the ~1h OAuth token lifetime so forwarded tokens are not held past their use.
+_CLIENT_CACHE_MAX = 64
+_CLIENT_TTL_SECONDS = 50 * 60
+_client_cache: OrderedDict[tuple[str, str, str], tuple[float, "WorkspaceClient"]] = OrderedDict()
+_client_cache_lock = threading.Lock()
+
+
+def _credential_digest(*parts: str) -> str:
+    """Cache-key digest of credentials; raw tokens and secrets never sit in the cache keys."""
+    return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+
+
+def _prediction_cache_key(endpoint_name: str, engineered: dict[str, Any]) -> tuple[Any, ...]:
+    return (endpoint_name, *sorted((k, round(v, 2) if isinstance(v, float) else v) for k, v in engineered.items()))
+
+
 def _validate_sql_identifier(value: str, label: str = "identifier") -> str:
     """Validate that a value is a safe SQL identifier (alphanumeric + underscore only)."""
-    if not value.replace("_", "").isalnum():
+    if not _SQL_IDENTIFIER_RE.match(value):
         raise ValueError(f"Invalid {label}: {value!r} — only alphanumeric and underscore allowed")
     return value
 
@@ -193,24 +225,43 @@ class DatabricksService:
         return self._client
     
     def _initialize_client(self) -> "WorkspaceClient | None":
-        """Initialize the Databricks SDK client with error handling (PAT/OBO or service principal)."""
+        """Initialize the Databricks SDK client with error handling (PAT/OBO or service principal).
+
+        Clients are shared per (host, credentials) so each request does not pay a fresh TLS handshake.
+        """
         host = self.config.host
         if not host:
             return None
+        token = self.config.token
+        if token:
+            key = (host, "pat", _credential_digest(token))
+        elif self.config.client_id and self.config.client_secret:
+            # The secret is part of the key, so a rotated secret gets a fresh client
+            key = (host, "sp", _credential_digest(self.config.client_id, self.config.client_secret))
+        else:
+            return None
+        with _client_cache_lock:
+            hit = _client_cache.get(key)
+            if hit is not None:
+                if time.monotonic() - hit[0] <= _CLIENT_TTL_SECONDS:
+                    _client_cache.move_to_end(key)
+                    return hit[1]
+                del _client_cache[key]
         try:
             from ..databricks_client_helpers import workspace_client_pat_only, workspace_client_service_principal
 
-            token = self.config.token
             if token:
                 client = workspace_client_pat_only(host=host, token=token)
-            elif self.config.client_id and self.config.client_secret:
+            else:
                 client = workspace_client_service_principal(
                     host=host,
-                    client_id=self.config.client_id,
-                    client_secret=self.config.client_secret,
+                    client_id=self.config.client_id or "",
+                    client_secret=self.config.client_secret or "",
                 )
-            else:
-                return None
+            with _client_cache_lock:
+                _client_cache[key] = (time.monotonic(), client)
+                if len(_client_cache) > _CLIENT_CACHE_MAX:
+                    _client_cache.popitem(last=False)
             logger.info("Databricks client initialized successfully")
             return client
         except ImportError:
@@ -1103,6 +1154,21 @@ class DatabricksService:
         except Exception:
             return []
 
+    async def get_approval_rule_by_id(self, id: str) -> dict[str, Any] | None:
+        """Fetch a single approval rule by id from Lakehouse (parameterized). Returns None when not found."""
+        table = self.config.full_schema_name + ".approval_rules"
+        query = f"""
+            SELECT id, name, rule_type, condition_expression, action_summary, priority, is_active, created_at, updated_at
+            FROM {table}
+            WHERE id = :rule_id
+            LIMIT 1
+            """
+        try:
+            rows = await self._execute_query_parameterized(query, {"rule_id": id})
+        except Exception:
+            return None
+        return rows[0] if rows else None
+
     async def create_approval_rule(
         self,
         *,
@@ -1139,6 +1205,33 @@ class DatabricksService:
             params["condition_expression"] = condition_expression
         return await self.execute_non_query_parameterized(stmt, params)
 
+    async def create_approval_rules(self, rows: list[dict[str, Any]]) -> bool:
+        """Insert several approval rules in one statement (parameterized). Row keys match ``create_approval_rule``."""
+        if not rows:
+            return True
+        table = self.config.full_schema_name + ".approval_rules"
+        values: list[str] = []
+        params: dict[str, str | int | float | bool] = {}
+        for i, row in enumerate(rows):
+            condition_expression = row.get("condition_expression")
+            cond_col = f":condition_expression_{i}" if condition_expression else "NULL"
+            values.append(
+                f"(:rule_id_{i}, :name_{i}, :rule_type_{i}, {cond_col}, :action_summary_{i}, :priority_{i}, :is_active_{i}, current_timestamp())"
+            )
+            params[f"rule_id_{i}"] = row["id"]
+            params[f"name_{i}"] = row["name"]
+            params[f"rule_type_{i}"] = row["rule_type"]
+            params[f"action_summary_{i}"] = row["action_summary"]
+            params[f"priority_{i}"] = row.get("priority", 100)
+            params[f"is_active_{i}"] = str(row.get("is_active", True)).upper()
+            if condition_expression:
+                params[f"condition_expression_{i}"] = condition_expression
+        stmt = f"""
+            INSERT INTO {table} (id, name, rule_type, condition_expression, action_summary, priority, is_active, updated_at)
+            VALUES {", ".join(values)}
+        """
+        return await self.execute_non_query_parameterized(stmt, params)
+
     async def update_approval_rule(
         self,
         id: str,
@@ -1181,6 +1274,15 @@ class DatabricksService:
         stmt = f"DELETE FROM {table} WHERE id = :rule_id"
         return await self.execute_non_query_parameterized(stmt, {"rule_id": id})
 
+    async def delete_approval_rules(self, ids: list[str]) -> bool:
+        """Delete several approval rules by id in one statement (parameterized)."""
+        if not ids:
+            return True
+        table = self.config.full_schema_name + ".approval_rules"
+        params: dict[str, str | int | float | bool] = {f"rule_id_{i}": rule_id for i, rule_id in enumerate(ids)}
+        stmt = f"DELETE FROM {table} WHERE id IN ({', '.join(':' + k for k in params)})"
+        return await self.execute_non_query_parameterized(stmt, params)
+
     async def get_online_features(
         self,
         *,
@@ -1503,12 +1605,23 @@ class DatabricksService:
             return mock_fallback()
 
         engineered = self._engineer_features(features, endpoint_name)
+        key = _prediction_cache_key(endpoint_name, engineered)
+        with _prediction_cache_lock:
+            hit = _prediction_cache.get(key)
+        if hit is not None and (time.monotonic() - hit[0]) <= _PREDICTION_CACHE_TTL_SECONDS:
+            return dict(hit[1])
         try:
             response = client.serving_endpoints.query(
                 name=endpoint_name,
                 dataframe_records=[engineered],
             )
-            return self._parse_model_response(response, endpoint_name)
+            result = self._parse_model_response(response, endpoint_name)
+            with _prediction_cache_lock:
+                _prediction_cache[key] = (time.monotonic(), result)
+                _prediction_cache.move_to_end(key)
+                if len(_prediction_cache) > _PREDICTION_CACHE_MAX:
+                    _prediction_cache.popitem(last=False)
+            return dict(result)
         except Exception as e:
             logger.error("Model endpoint %s failed: %s", endpoint_name, e)
             return mock_fallback()
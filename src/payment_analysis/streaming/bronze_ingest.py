@@ -72,14 +72,16 @@ def payments_raw_bronze():
 )
 def merchants_dim_bronze():
     """Merchant dimension table for enrichment."""
-    
+    merchant_num = col("id").cast("string")
+    # One projection for all columns (a single Project node instead of one per withColumn)
     return (
         spark.range(100)  # type: ignore[name-defined]  # Must match MERCHANTS in transaction_simulator (100 merchants)
-        .withColumn("merchant_id", concat(lit("m_"), col("id").cast("string")))
-        .withColumn("merchant_name", concat(lit("Merchant "), col("id").cast("string")))
-        .withColumn("merchant_segment", array(lit("Travel"), lit("Retail"), lit("Gaming"), lit("Digital"), lit("Entertainment"), lit("Grocery"), lit("Fuel"), lit("Subscription")).getItem((col("id") % 8).cast("int")))
-        .withColumn("merchant_country", array(lit("US"), lit("GB"), lit("CA")).getItem((col("id") % 3).cast("int")))
-        .withColumn("merchant_risk_tier", array(lit("low"), lit("medium"), lit("high")).getItem((col("id") % 3).cast("int")))
-        .withColumn("created_at", current_timestamp())
-        .drop("id")
+        .select(
+            concat(lit("m_"), merchant_num).alias("merchant_id"),
+            concat(lit("Merchant "), merchant_num).alias("merchant_name"),
+            array(lit("Travel"), lit("Retail"), lit("Gaming"), lit("Digital"), lit("Entertainment"), lit("Grocery"), lit("Fuel"), lit("Subscription")).getItem((col("id") % 8).cast("int")).alias("merchant_segment"),
+            array(lit("US"), lit("GB"), lit("CA")).getItem((col("id") % 3).cast("int")).alias("merchant_country"),
+            array(lit("low"), lit("medium"), lit("high")).getItem((col("id") % 3).cast("int")).alias("merchant_risk_tier"),
+            current_timestamp().alias("created_at"),
+        )
     )
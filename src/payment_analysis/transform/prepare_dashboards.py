@@ -12,6 +12,7 @@
 
 # COMMAND ----------
 
+import importlib.util
 import os
 import subprocess
 import sys
@@ -24,11 +25,22 @@ if not workspace_path or not catalog or not schema:
     raise ValueError("Widgets workspace_path, catalog, and schema are required")
 
 os.chdir(workspace_path)
-result = subprocess.run(
-    [sys.executable, "scripts/dashboards.py", "prepare", "--catalog", catalog, "--schema", schema],
-    capture_output=False,
-)
-if result.returncode != 0:
-    sys.exit(result.returncode)
+# Run prepare in-process (scripts/dashboards.py is stdlib-only); spawn an interpreter only if it cannot be loaded.
+spec = importlib.util.spec_from_file_location("dashboards", os.path.join(workspace_path, "scripts", "dashboards.py"))
+try:
+    if spec is None or spec.loader is None:
+        raise ImportError("scripts/dashboards.py not found")
+    dashboards = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(dashboards)
+except (ImportError, OSError) as e:
+    print(f"Could not load scripts/dashboards.py in-process ({e}); running it as a subprocess.")
+    result = subprocess.run(
+        [sys.executable, "scripts/dashboards.py", "prepare", "--catalog", catalog, "--schema", schema],
+        capture_output=False,
+    )
+    if result.returncode != 0:
+        sys.exit(result.returncode)
+else:
+    dashboards.cmd_prepare(catalog, schema)
 
 print("Prepare completed. dashboards/ and .build/transform are updated.")
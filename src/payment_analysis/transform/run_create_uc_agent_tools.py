@@ -11,7 +11,8 @@
 # COMMAND ----------
 
 import os
-import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 
 dbutils.widgets.text("workspace_path", "")  # type: ignore[name-defined]
 dbutils.widgets.text("catalog", "ahs_demos_catalog")  # type: ignore[name-defined]
@@ -39,8 +40,12 @@ else:
 with open(sql_path, encoding="utf-8") as f:
     raw = f.read()
 sql_text = raw.replace("__CATALOG__", catalog).replace("__SCHEMA__", schema)
-parts = re.split(r";\s*(?=\n|$)", sql_text)
-statements = [s.strip() for s in parts if s.strip()]
+
+# Shared statement splitter lives next to the SQL file; load it by path (this notebook does not import the package).
+sys.path.insert(0, os.path.dirname(sql_path))
+from sql_statements import split_sql_statements  # noqa: E402
+
+statements = split_sql_statements(sql_text)
 
 try:
     _spark = spark  # noqa: F821
@@ -48,9 +53,10 @@ except NameError:
     from pyspark.sql import SparkSession
     _spark = SparkSession.builder.getOrCreate()
 
-for stmt in statements:
-    if stmt:
-        _spark.sql(stmt)
+# Each statement is an independent CREATE OR REPLACE FUNCTION, so submit them concurrently
+# to overlap the per-DDL catalog round-trips.
+with ThreadPoolExecutor(max_workers=8) as executor:
+    list(executor.map(_spark.sql, statements))
 
 print(f"Created {len(statements)} UC agent tool functions in {catalog}.{schema}")
 
@@ -266,6 +266,17 @@ with psycopg.connect(conn_str, row_factory=dict_row) as conn:
             )
         """)
         conn.commit()
+        # Dashboard reads the newest rows of the last 24h, optionally per source; these let it
+        # walk the index in created_at order instead of sorting the whole table.
+        cur.execute(
+            f'CREATE INDEX IF NOT EXISTS idx_online_features_created_at ON "{lakebase_schema}".online_features '
+            "(created_at DESC) INCLUDE (source, feature_set, feature_name, feature_value, feature_value_str, entity_id)"
+        )
+        cur.execute(
+            f'CREATE INDEX IF NOT EXISTS idx_online_features_source_created_at ON "{lakebase_schema}".online_features '
+            "(source, created_at DESC)"
+        )
+        conn.commit()
         print("online_features table ensured.")
 
         # App settings: key-value for job parameters and config (backend reads at startup)
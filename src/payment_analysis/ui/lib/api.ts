@@ -456,6 +456,7 @@ export interface HealthDatabaseOut {
   connection_healthy: boolean;
   database_instance_exists: boolean;
   lakebase_mode?: string;
+  pool_status?: string;
   status: string;
 }
 